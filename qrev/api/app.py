@@ -1,5 +1,6 @@
 """FastAPI application for QReviewer."""
 
+import asyncio
 import os
 import uuid
 from fastapi import FastAPI, Depends, HTTPException, status
@@ -8,7 +9,8 @@ from .models import (
     ReviewRequest, ReviewResponse, FetchPRRequest, FetchPRResponse,
     ReviewHunksRequest, ReviewHunksResponse, RenderReportRequest,
     RenderReportResponse, ScoreRequest, ScoreResponse,
-    LearnFromRepositoryRequest, LearnFromRepositoryResponse
+    LearnFromRepositoryRequest, LearnFromRepositoryResponse,
+    LearnFromRepositoriesRequest, LearnFromRepositoriesResponse
 )
 from .security import require_api_key
 from .utils import make_request_id, hash_html, timed
@@ -82,6 +84,11 @@ async def root():
                     <p>🤖 NEW: Learn from repository review history using AI analysis</p>
                 </div>
                 
+                <div class="endpoint ai">
+                    <div class="method">POST /learn_from_repositories</div>
+                    <p>Learn from several repositories in one request</p>
+                </div>
+                
                 <h2>Documentation</h2>
                 <p><a href="/docs">Interactive API docs (Swagger UI)</a></p>
                 <p><a href="/redoc">ReDoc documentation</a></p>
@@ -240,6 +247,24 @@ def calculate_score(findings) -> float:
 
 
 # New AI-powered learning endpoints
+def _learning_response(learner, context, output_file: str) -> LearnFromRepositoryResponse:
+    """Build the success response for one learned repository."""
+    return LearnFromRepositoryResponse(
+        success=True,
+        repository=context.repository,
+        summary={
+            "total_prs": context.total_prs,
+            "total_reviews": context.total_reviews,
+            "total_comments": context.total_comments
+        },
+        learnedStandards=learner.generate_learned_standards(context),
+        commonIssues=context.common_issues,
+        teamPreferences=context.team_preferences,
+        outputFile=output_file,
+        message=f"Successfully learned from {context.total_prs} PRs with {context.total_reviews} reviews"
+    )
+
+
 @app.post("/learn_from_repository", response_model=LearnFromRepositoryResponse)
 async def learn_from_repository_endpoint(req: LearnFromRepositoryRequest, _ok: bool = Depends(require_api_key)):
     """
@@ -271,9 +296,11 @@ async def learn_from_repository_endpoint(req: LearnFromRepositoryRequest, _ok: b
         # Start learning process (this is a one-time task as requested)
         print(f"🤖 Starting AI learning from repository: {req.repositoryUrl}")
         
-        # Run the learning process
+        # Run the learning process; it makes blocking GitHub calls (and may
+        # sleep out a rate limit), so keep it off the event loop
         from ..learning import learn_from_repository
-        context = learn_from_repository(
+        context = await asyncio.to_thread(
+            learn_from_repository,
             repo_url=req.repositoryUrl,
             token=token,
             max_prs=req.maxPRs
@@ -285,36 +312,21 @@ async def learn_from_repository_endpoint(req: LearnFromRepositoryRequest, _ok: b
         output_file = req.outputFile or f"learning_results_{task_id[:8]}.json"
         learner.save_learning_results(context, output_file)
         
+        response = _learning_response(learner, context, output_file)
+        
         # Update task status
         learning_tasks[task_id]["status"] = "completed"
         learning_tasks[task_id]["progress"] = 100.0
         learning_tasks[task_id]["current_step"] = "Learning completed"
         learning_tasks[task_id]["results"] = {
-            "repository": context.repository,
-            "summary": {
-                "total_prs": context.total_prs,
-                "total_reviews": context.total_reviews,
-                "total_comments": context.total_comments
-            },
-            "learned_standards": learner.generate_learned_standards(context),
-            "common_issues": context.common_issues,
-            "team_preferences": context.team_preferences
+            "repository": response.repository,
+            "summary": response.summary,
+            "learned_standards": response.learnedStandards,
+            "common_issues": response.commonIssues,
+            "team_preferences": response.teamPreferences
         }
         
-        return LearnFromRepositoryResponse(
-            success=True,
-            repository=context.repository,
-            summary={
-                "total_prs": context.total_prs,
-                "total_reviews": context.total_reviews,
-                "total_comments": context.total_comments
-            },
-            learnedStandards=learner.generate_learned_standards(context),
-            commonIssues=context.common_issues,
-            teamPreferences=context.team_preferences,
-            outputFile=output_file,
-            message=f"Successfully learned from {context.total_prs} PRs with {context.total_reviews} reviews"
-        )
+        return response
         
     except Exception as e:
         import logging
@@ -330,6 +342,59 @@ async def learn_from_repository_endpoint(req: LearnFromRepositoryRequest, _ok: b
         )
 
 
+@app.post("/learn_from_repositories", response_model=LearnFromRepositoriesResponse)
+async def learn_from_repositories_endpoint(req: LearnFromRepositoriesRequest, _ok: bool = Depends(require_api_key)):
+    """
+    Learn from several repositories in a single request.
+    
+    One learner (and its GitHub auth headers) is shared across all
+    repositories. A failure on one repository is reported in its result
+    entry and does not abort the rest of the batch.
+    """
+    token = os.getenv("GITHUB_TOKEN")
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="GITHUB_TOKEN environment variable is required"
+        )
+    
+    from ..learning import RepositoryLearner
+    learner = RepositoryLearner(token)
+    results = []
+    
+    for repo_url in req.repositoryUrls:
+        try:
+            print(f"🤖 Starting AI learning from repository: {repo_url}")
+            # Analysis makes blocking GitHub calls; keep them off the event loop
+            context = await asyncio.to_thread(
+                learner.analyze_repository,
+                repo_url,
+                max_prs=req.maxPRs,
+                include_comments=req.includeComments,
+                include_reviews=req.includeReviews
+            )
+            
+            output_file = f"learning_results_{make_request_id()[:8]}.json"
+            learner.save_learning_results(context, output_file)
+            
+            results.append(_learning_response(learner, context, output_file))
+        except Exception as e:
+            import logging
+            logging.error(f"Repository learning failed for {repo_url}: {str(e)}")
+            
+            results.append(LearnFromRepositoryResponse(
+                success=False,
+                repository=repo_url,
+                summary={},
+                learnedStandards={},
+                commonIssues=[],
+                teamPreferences={},
+                message=str(e)
+            ))
+    
+    return LearnFromRepositoriesResponse(results=results)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -194,6 +194,19 @@ class LearnFromRepositoryResponse(BaseModel):
     message: str = Field(..., description="Success or error message")
 
 
+class LearnFromRepositoriesRequest(BaseModel):
+    """Request to learn from several repositories in a single call."""
+    repositoryUrls: List[str] = Field(..., min_length=1, description="GitHub repository URLs")
+    maxPRs: int = Field(100, description="Maximum number of PRs to analyze per repository")
+    includeComments: bool = Field(True, description="Include PR comments in analysis")
+    includeReviews: bool = Field(True, description="Include PR reviews in analysis")
+
+
+class LearnFromRepositoriesResponse(BaseModel):
+    """Response from a batched repository learning process."""
+    results: List[LearnFromRepositoryResponse] = Field(..., description="Per-repository results, in request order")
+
+
 class GetLearningStatusRequest(BaseModel):
     """Request to get learning process status."""
     taskId: str = Field(..., description="Learning task ID")
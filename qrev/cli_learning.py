@@ -40,7 +40,9 @@ class ModuleLearningCLI:
         output_dir: str = "learning_results",
         include_comments: bool = True,
         include_reviews: bool = True,
-        sample_strategy: str = "representative"
+        sample_strategy: str = "representative",
+        force: bool = False,
+        confirm: bool = True
     ):
         """
         Learn from specific modules in a large repository.
@@ -54,6 +56,9 @@ class ModuleLearningCLI:
             include_comments: Include PR comments in analysis
             include_reviews: Include PR reviews in analysis
             sample_strategy: Sampling strategy ('recent', 'representative', 'high_impact')
+            force: Ignore per-PR results cached in output_dir/.cache and refetch them
+            confirm: Show the learning plan and ask before starting; pass False when
+                the caller has already confirmed (e.g. several repos trained in parallel)
         """
         
         # Validate GitHub token
@@ -73,18 +78,21 @@ class ModuleLearningCLI:
             output_path.mkdir(exist_ok=True)
             
             # Initialize learner
-            self.learner = RepositoryLearner(token)
-            
-            # Display learning plan
-            self._display_learning_plan(
-                repo_url, modules, max_prs_per_module, 
-                max_total_prs, sample_strategy
+            self.learner = RepositoryLearner(
+                token, cache_dir=output_path / ".cache", refresh_cache=force
             )
             
-            # Confirm with user
-            if not typer.confirm("Proceed with learning?"):
-                console.print("[yellow]Learning cancelled[/yellow]")
-                return False
+            if confirm:
+                # Display learning plan
+                self._display_learning_plan(
+                    repo_url, modules, max_prs_per_module, 
+                    max_total_prs, sample_strategy
+                )
+                
+                # Confirm with user
+                if not typer.confirm("Proceed with learning?"):
+                    console.print("[yellow]Learning cancelled[/yellow]")
+                    return False
             
             # Start learning process
             results = self._execute_module_learning(
@@ -333,6 +341,9 @@ def learn(
     ),
     include_reviews: bool = typer.Option(
         True, "--no-reviews", help="Exclude PR reviews from analysis"
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Ignore cached per-PR results and refetch them"
     )
 ):
     """
@@ -363,7 +374,8 @@ def learn(
         output_dir=output_dir,
         include_comments=include_comments,
         include_reviews=include_reviews,
-        sample_strategy=sample_strategy
+        sample_strategy=sample_strategy,
+        force=force
     )
     
     if success:
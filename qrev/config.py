@@ -11,6 +11,10 @@ class QReviewerConfig:
     """Configuration manager for QReviewer."""
     
     def __init__(self):
+        self.reload()
+    
+    def reload(self):
+        """Re-read all settings from the environment into this instance."""
         # LLM Configuration
         self.llm_backend: LLMBackend = self._get_llm_backend()
         
@@ -1,10 +1,16 @@
 """Unified diff parsing and hunk extraction."""
 
 import re
-from typing import List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 from .models import Hunk, PRFilePatch
 
 
+_HUNK_RE = re.compile(r"^@@ -(\d+),(\d+) \+(\d+),(\d+) @@")
+_HUNK_SPLIT_RE = re.compile(
+    r"(@@ -\d+,\d+ \+\d+,\d+ @@.*?)(?=@@ -\d+,\d+ \+\d+,\d+ @@|$)", re.DOTALL
+)
+
+
 def infer_language(file_path: str) -> Optional[str]:
     """Infer programming language from file extension."""
     extension_map = {
@@ -53,8 +59,7 @@ def infer_language(file_path: str) -> Optional[str]:
 
 def parse_hunk_header(header: str) -> Tuple[int, int, int, int]:
     """Parse hunk header @@ -a,b +c,d @@ to extract line numbers."""
-    pattern = r"^@@ -(\d+),(\d+) \+(\d+),(\d+) @@"
-    match = re.match(pattern, header)
+    match = _HUNK_RE.match(header)
     if not match:
         raise ValueError(f"Invalid hunk header: {header}")
     
@@ -68,8 +73,7 @@ def split_patch_into_hunks(patch: str, file_path: str) -> List[Hunk]:
         return []
     
     # Split by hunk headers
-    hunk_pattern = r"(@@ -\d+,\d+ \+\d+,\d+ @@.*?)(?=@@ -\d+,\d+ \+\d+,\d+ @@|$)"
-    hunks = re.findall(hunk_pattern, patch, re.DOTALL)
+    hunks = _HUNK_SPLIT_RE.findall(patch)
     
     result = []
     for hunk_text in hunks:
@@ -103,13 +107,79 @@ def split_patch_into_hunks(patch: str, file_path: str) -> List[Hunk]:
     return result
 
 
+def iter_hunks_from_files(files: Iterable[PRFilePatch]) -> Iterator[Hunk]:
+    """Lazily yield hunks from PR files, parsing each patch only when reached."""
+    for file_patch in files:
+        if file_patch.patch:
+            yield from split_patch_into_hunks(file_patch.patch, file_patch.path)
+
+
 def extract_hunks_from_files(files: List[PRFilePatch]) -> List[Hunk]:
     """Extract hunks from all PR files."""
-    all_hunks = []
+    return list(iter_hunks_from_files(files))
+
+
+def trim_hunk(hunk: Hunk, context: int = 3) -> Hunk:
+    """Drop unchanged lines more than `context` lines away from any +/- line.
     
-    for file_patch in files:
-        if file_patch.patch:
-            hunks = split_patch_into_hunks(file_patch.patch, file_patch.path)
-            all_hunks.extend(hunks)
+    Returns the hunk unchanged if nothing would be dropped, otherwise a copy
+    with the trimmed patch text, so less text is sent to the LLM per review.
+    Each kept region gets a recomputed @@ header (the first one becomes the
+    hunk header, later ones are written into the patch text) so line numbers
+    stay correct.
+    """
+    lines = hunk.patch_text.split('\n')
+    keep = set()
+    for i, line in enumerate(lines):
+        if line.startswith(('+', '-')):
+            keep.update(range(max(0, i - context), min(len(lines), i + context + 1)))
+    
+    if not keep or len(keep) == len(lines):
+        return hunk
+    
+    try:
+        old_line, _, new_line, _ = parse_hunk_header(hunk.hunk_header)
+    except ValueError:
+        return hunk
+    # Function context git appends after the closing @@, e.g. " def f():";
+    # it describes where the hunk starts, so only the first region keeps it
+    suffix = hunk.hunk_header[_HUNK_RE.match(hunk.hunk_header).end():]
+    
+    # Group kept lines into contiguous regions, noting where each starts in
+    # the old and new file
+    regions = []
+    for i, line in enumerate(lines):
+        if i in keep:
+            if not regions or i - 1 not in keep:
+                regions.append((old_line, new_line, []))
+            regions[-1][2].append(line)
+        if line.startswith('-'):
+            old_line += 1
+        elif line.startswith('+'):
+            new_line += 1
+        elif not line.startswith('\\'):
+            old_line += 1
+            new_line += 1
+    
+    headers = []
+    for old_start, new_start, region in regions:
+        old_count = sum(1 for line in region if not line.startswith(('+', '\\')))
+        new_count = sum(1 for line in region if not line.startswith(('-', '\\')))
+        # An empty side points at the line before it, as in git's headers
+        headers.append(
+            f"@@ -{old_start if old_count else old_start - 1},{old_count} "
+            f"+{new_start if new_count else new_start - 1},{new_count} @@"
+        )
+    
+    parts = ['\n'.join(regions[0][2])]
+    for header, (_, _, region) in zip(headers[1:], regions[1:]):
+        parts.append(header + '\n' + '\n'.join(region))
     
-    return all_hunks
+    last_new_start, last_region = regions[-1][1], regions[-1][2]
+    last_new_count = sum(1 for line in last_region if not line.startswith(('-', '\\')))
+    return hunk.model_copy(update={
+        "hunk_header": headers[0] + suffix,
+        "patch_text": '\n'.join(parts),
+        "start_line": regions[0][1],
+        "end_line": max(regions[0][1], last_new_start + last_new_count - 1),
+    })
@@ -1,9 +1,15 @@
 """GitHub API client for fetching PR information."""
 
+import hashlib
+import json
 import os
 import re
-from typing import List, Tuple
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .models import PRInfo, PRFilePatch, PRDiff
 
 
@@ -23,8 +29,63 @@ def parse_pr_url(url: str) -> Tuple[str, str, int]:
     return owner, repo, int(number)
 
 
-def fetch_pr_files(pr_url: str) -> PRDiff:
-    """Fetch PR files with pagination."""
+# Shared GitHub session: throttled and gateway-error responses are retried
+# with backoff, waiting out any Retry-After header GitHub sends
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)))
+
+# Default location for ETag-revalidated API responses
+DEFAULT_CACHE_DIR = ".qrev_cache"
+
+
+def _get_files_page(url: str, headers: dict, cache_dir: Optional[Path] = None) -> list:
+    """Fetch one page of PR files, revalidating a cached copy by ETag if available.
+    
+    A 304 Not Modified reply does not count against the GitHub rate limit,
+    so re-fetching an unchanged PR costs one round trip per page and no quota.
+    """
+    if cache_dir is None:
+        response = _session.get(url, headers=headers)
+        if response.status_code != 200:
+            raise GitHubAPIError(f"GitHub API error: {response.status_code} - {response.text}")
+        return response.json()
+    
+    key = hashlib.sha1(url.encode()).hexdigest()
+    body_path = cache_dir / f"{key}.json"
+    etag_path = cache_dir / f"{key}.etag"
+    
+    request_headers = dict(headers)
+    if body_path.exists() and etag_path.exists():
+        request_headers["If-None-Match"] = etag_path.read_text()
+    
+    response = _session.get(url, headers=request_headers)
+    
+    if response.status_code == 304:
+        return json.loads(body_path.read_text())
+    if response.status_code != 200:
+        raise GitHubAPIError(f"GitHub API error: {response.status_code} - {response.text}")
+    
+    etag = response.headers.get("ETag")
+    if etag:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        body_path.write_text(response.text)
+        etag_path.write_text(etag)
+    return response.json()
+
+
+def fetch_pr_files(pr_url: str, cache_dir: Optional[str] = None) -> PRDiff:
+    """Fetch PR files with pagination.
+    
+    If cache_dir is given, each page is cached there and revalidated with
+    If-None-Match on later calls.
+    """
     token = os.getenv("GITHUB_TOKEN")
     if not token:
         raise GitHubAPIError("GITHUB_TOKEN environment variable is required")
@@ -39,18 +100,15 @@ def fetch_pr_files(pr_url: str) -> PRDiff:
     
     base_url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/files"
     
+    cache_path = Path(cache_dir) if cache_dir is not None else None
+    
     all_files = []
     page = 1
     per_page = 100
     
     while True:
         url = f"{base_url}?per_page={per_page}&page={page}"
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code != 200:
-            raise GitHubAPIError(f"GitHub API error: {response.status_code} - {response.text}")
-        
-        files = response.json()
+        files = _get_files_page(url, headers, cache_path)
         if not files:
             break
             
@@ -81,3 +139,13 @@ def fetch_pr_files(pr_url: str) -> PRDiff:
     )
     
     return PRDiff(pr=pr_info, files=pr_files)
+
+
+@lru_cache(maxsize=128)
+def cached_fetch_pr_files(pr_url: str, cache_dir: str = DEFAULT_CACHE_DIR) -> PRDiff:
+    """Fetch PR files, reusing ETag-validated responses cached in cache_dir.
+    
+    Results are also memoized per process, so repeated calls for the same PR
+    return the same PRDiff without touching the network; treat it as read-only.
+    """
+    return fetch_pr_files(pr_url, cache_dir=cache_dir)
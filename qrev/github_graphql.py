@@ -0,0 +1,98 @@
+"""Batched PR file listing through the GitHub GraphQL API."""
+
+import os
+from typing import List, Tuple
+
+from .github_api import GitHubAPIError, _session, parse_pr_url
+from .models import PRInfo, PRFilePatch, PRDiff
+
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# GraphQL changeType values mapped to the REST API's file status strings
+_CHANGE_TYPE_STATUS = {
+    "ADDED": "added",
+    "MODIFIED": "modified",
+    "DELETED": "removed",
+    "RENAMED": "renamed",
+    "COPIED": "copied",
+    "CHANGED": "changed",
+}
+
+_PR_FILES_FIELDS = """
+      files(first: 100) {
+        nodes { path additions deletions changeType }
+        pageInfo { hasNextPage }
+      }"""
+
+
+def build_pr_files_query(prs: List[Tuple[str, str, int]]) -> Tuple[str, dict]:
+    """Build one aliased query (pr0, pr1, ...) covering every (owner, repo, number)."""
+    declarations = []
+    selections = []
+    variables = {}
+
+    for i, (owner, repo, number) in enumerate(prs):
+        declarations.append(f"$owner{i}: String!, $name{i}: String!, $number{i}: Int!")
+        selections.append(
+            f"  pr{i}: repository(owner: $owner{i}, name: $name{i}) {{\n"
+            f"    pullRequest(number: $number{i}) {{{_PR_FILES_FIELDS}\n    }}\n  }}"
+        )
+        variables.update({f"owner{i}": owner, f"name{i}": repo, f"number{i}": number})
+
+    query = f"query({', '.join(declarations)}) {{\n" + "\n".join(selections) + "\n}"
+    return query, variables
+
+
+def fetch_pr_files_batch(pr_urls: List[str]) -> List[PRDiff]:
+    """Fetch the changed-file lists of several PRs in a single GraphQL request.
+
+    One request (and one rate-limit point) replaces a REST listing per PR.
+    GraphQL does not expose per-file patch text, so every PRFilePatch has
+    patch=None; use fetch_pr_files when the hunks themselves are needed.
+    Only the first 100 files of each PR are returned.
+    """
+    token = os.getenv("GITHUB_TOKEN")
+    if not token:
+        raise GitHubAPIError("GITHUB_TOKEN environment variable is required")
+
+    prs = [parse_pr_url(url) for url in pr_urls]
+    if not prs:
+        return []
+
+    query, variables = build_pr_files_query(prs)
+    headers = {
+        "Authorization": f"bearer {token}",
+        "User-Agent": "QReviewer/0.1.0"
+    }
+
+    response = _session.post(GRAPHQL_URL, json={"query": query, "variables": variables}, headers=headers)
+    if response.status_code != 200:
+        raise GitHubAPIError(f"GitHub API error: {response.status_code} - {response.text}")
+
+    payload = response.json()
+    if payload.get("errors"):
+        messages = "; ".join(error.get("message", "") for error in payload["errors"])
+        raise GitHubAPIError(f"GitHub GraphQL error: {messages}")
+
+    results = []
+    for i, (url, (owner, repo, number)) in enumerate(zip(pr_urls, prs)):
+        pull_request = payload["data"][f"pr{i}"]["pullRequest"]
+        if pull_request["files"].get("pageInfo", {}).get("hasNextPage"):
+            print(f"⚠️  {owner}/{repo}#{number} has more than 100 files; only the first 100 were listed")
+        files = [
+            PRFilePatch(
+                path=node["path"],
+                status=_CHANGE_TYPE_STATUS.get(node["changeType"], node["changeType"].lower()),
+                patch=None,
+                additions=node.get("additions", 0),
+                deletions=node.get("deletions", 0)
+            )
+            for node in pull_request["files"]["nodes"]
+        ]
+        results.append(PRDiff(
+            pr=PRInfo(url=url, number=number, repo=f"{owner}/{repo}"),
+            files=files
+        ))
+
+    return results
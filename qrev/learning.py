@@ -1,12 +1,15 @@
 """AI-powered learning from repository review history."""
 
+import asyncio
 import os
 import re
 import json
+import time
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass, asdict
 import requests
+from .github_api import _session
 from .github_review import GitHubReviewError
 
 
@@ -37,6 +40,70 @@ class LearningContext:
     common_issues: List[Dict[str, Any]]
 
 
+# Ceiling on concurrent connections to api.github.com while fetching PR details
+GITHUB_MAX_CONCURRENCY = 64
+
+# (connect, read) timeout for GitHub REST calls, so one stalled request cannot
+# hang a whole training run
+GITHUB_TIMEOUT = (10, 60)
+
+# Attempts and first backoff delay (doubling) for async GitHub GETs that hit a
+# connection error or a throttled/gateway response
+GITHUB_MAX_ATTEMPTS = 5
+GITHUB_BACKOFF_SEC = 0.5
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# PRs per page when listing /pulls, and how many pages are requested at once
+PR_PAGE_SIZE = 100
+PR_PAGE_CONCURRENCY = 10
+
+# How long cached per-PR reviews/comments are trusted before being refetched
+PR_CACHE_TTL_SEC = 7 * 24 * 3600
+
+
+def _can_run_async() -> bool:
+    """Whether a sync caller may drive aiohttp through asyncio.run here."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            return False
+        return True
+    return False
+
+
+class GitHubRateLimiter:
+    """Pause requests while the GitHub primary rate limit is exhausted.
+    
+    Tracks X-RateLimit-Remaining / X-RateLimit-Reset from each response and,
+    once no requests remain, makes callers sleep until the reset time.
+    """
+    
+    def __init__(self):
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        self._lock = asyncio.Lock()
+    
+    def update(self, headers) -> None:
+        """Record the rate-limit state reported by a response."""
+        if "X-RateLimit-Remaining" in headers:
+            self.remaining = int(headers["X-RateLimit-Remaining"])
+        if "X-RateLimit-Reset" in headers:
+            self.reset_at = float(headers["X-RateLimit-Reset"])
+    
+    async def wait(self) -> None:
+        """Sleep until the limit resets if no requests remain."""
+        async with self._lock:
+            if self.remaining == 0:
+                delay = self.reset_at - time.time()
+                if delay > 0:
+                    print(f"⏳ GitHub rate limit exhausted, waiting {delay:.0f}s for reset")
+                    await asyncio.sleep(delay)
+                self.remaining = None
+
+
 def parse_repository_url(repo_url: str) -> Tuple[str, str]:
     """Parse GitHub repository URL to extract owner and repo.
     
@@ -65,8 +132,16 @@ def parse_repository_url(repo_url: str) -> Tuple[str, str]:
 class RepositoryLearner:
     """Learns from repository review history using AI analysis."""
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, cache_dir: Optional[Path] = None, refresh_cache: bool = False):
+        """
+        Args:
+            token: GitHub token
+            cache_dir: Directory for per-PR results keyed by head SHA (None disables)
+            refresh_cache: Ignore existing cache entries, refetch, and rewrite them
+        """
         self.token = token
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.refresh_cache = refresh_cache
         self.headers = {
             "Authorization": f"token {token}",
             "Accept": "application/vnd.github.v3+json",
@@ -119,6 +194,11 @@ class RepositoryLearner:
         
         print(f"📋 Analyzing {len(prs)} PRs...")
         
+        # Reviews and comments for every sampled PR, fetched up front
+        pr_details = self._fetch_pr_details_cached(
+            api_base, prs, include_reviews, include_comments
+        )
+        
         total_reviews = 0
         total_comments = 0
         file_patterns = {}
@@ -131,17 +211,17 @@ class RepositoryLearner:
             pr_number = pr["number"]
             print(f"  📝 PR #{pr_number} ({i+1}/{len(prs)})")
             
-            # Get PR reviews if requested
+            reviews, comments = pr_details[pr_number]
+            
+            # Analyze PR reviews if requested
             if include_reviews:
-                reviews = self._get_pr_reviews(api_base, pr_number)
                 total_reviews += len(reviews)
                 
                 # Analyze review patterns
                 self._analyze_review_patterns(reviews, team_preferences)
             
-            # Get PR comments if requested
+            # Analyze PR comments if requested
             if include_comments:
-                comments = self._get_pr_comments(api_base, pr_number)
                 total_comments += len(comments)
                 
                 # Analyze comment patterns
@@ -175,32 +255,9 @@ class RepositoryLearner:
     ) -> List[Dict[str, Any]]:
         """Get PRs using the specified sampling strategy."""
         
-        # Get all PRs first (we'll sample from these)
-        all_prs = []
-        page = 1
-        per_page = 100
-        
-        while len(all_prs) < max_prs * 3:  # Get more than needed for sampling
-            url = f"{api_base}/pulls?state=all&per_page={per_page}&page={page}"
-            response = requests.get(url, headers=self.headers)
-            
-            if response.status_code != 200:
-                print(f"⚠️  Failed to fetch PRs page {page}: {response.status_code}")
-                break
-            
-            page_prs = response.json()
-            if not page_prs:
-                break
-                
-            all_prs.extend(page_prs)
-            page += 1
-            
-            # Respect rate limits
-            if "X-RateLimit-Remaining" in response.headers:
-                remaining = int(response.headers["X-RateLimit-Remaining"])
-                if remaining < 10:
-                    print(f"⚠️  Rate limit low: {remaining} requests remaining")
-                    break
+        # Get all PRs first (we'll sample from these); more than needed for sampling
+        pages = -(-max_prs * 3 // PR_PAGE_SIZE)
+        all_prs = self._list_prs(api_base, pages)
         
         print(f"📋 Found {len(all_prs)} total PRs")
         
@@ -226,6 +283,122 @@ class RepositoryLearner:
         
         return sampled_prs[:max_prs]
     
+    def _github_get(self, url: str) -> requests.Response:
+        """GET a GitHub API URL with retries and a bounded timeout.
+        
+        The shared session retries connection errors and 429/5xx responses
+        with backoff; a 403 from an exhausted rate limit waits for the reset
+        and is tried once more.
+        """
+        response = _session.get(url, headers=self.headers, timeout=GITHUB_TIMEOUT)
+        
+        if response.status_code == 403 and response.headers.get("X-RateLimit-Remaining") == "0":
+            delay = float(response.headers.get("X-RateLimit-Reset", 0)) - time.time()
+            if delay > 0:
+                print(f"⏳ GitHub rate limit exhausted, waiting {delay:.0f}s for reset")
+                time.sleep(delay)
+            response = _session.get(url, headers=self.headers, timeout=GITHUB_TIMEOUT)
+        
+        return response
+    
+    def _list_prs(self, api_base: str, pages: int) -> List[Dict[str, Any]]:
+        """List up to `pages` pages of PRs, newest first, concurrently when possible.
+        
+        Falls back to fetching page by page when aiohttp is unavailable or when
+        called from inside a running event loop.
+        """
+        if _can_run_async():
+            return asyncio.run(self._list_prs_async(api_base, pages))
+        
+        all_prs = []
+        for page in range(1, pages + 1):
+            url = f"{api_base}/pulls?state=all&per_page={PR_PAGE_SIZE}&page={page}"
+            response = self._github_get(url)
+            
+            if response.status_code != 200:
+                print(f"⚠️  Failed to fetch PRs page {page}: {response.status_code}")
+                break
+            
+            page_prs = response.json()
+            if not page_prs:
+                break
+                
+            all_prs.extend(page_prs)
+            
+            # Respect rate limits
+            if "X-RateLimit-Remaining" in response.headers:
+                remaining = int(response.headers["X-RateLimit-Remaining"])
+                if remaining < 10:
+                    print(f"⚠️  Rate limit low: {remaining} requests remaining")
+                    break
+        
+        return all_prs
+    
+    def _client_session(self, limit_per_host: int):
+        """aiohttp session for GitHub with the same bounded timeouts as the sync path."""
+        import aiohttp
+        
+        timeout = aiohttp.ClientTimeout(sock_connect=GITHUB_TIMEOUT[0], sock_read=GITHUB_TIMEOUT[1])
+        connector = aiohttp.TCPConnector(limit_per_host=limit_per_host)
+        return aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout)
+    
+    async def _aget_json(self, session, url: str, limiter: GitHubRateLimiter) -> Optional[Any]:
+        """GET a GitHub URL and parse its JSON, or None if it still fails after retries.
+        
+        Connection errors, timeouts, 429/502/503/504 and rate-limited 403s are
+        retried up to GITHUB_MAX_ATTEMPTS times with exponential backoff (or
+        the server's Retry-After); the limiter waits out an exhausted limit.
+        """
+        import aiohttp
+        
+        status = None
+        for attempt in range(GITHUB_MAX_ATTEMPTS):
+            await limiter.wait()
+            retry_after = None
+            try:
+                async with session.get(url) as response:
+                    limiter.update(response.headers)
+                    status = response.status
+                    if status == 200:
+                        return await response.json()
+                    rate_limited = status == 403 and response.headers.get("X-RateLimit-Remaining") == "0"
+                    if status not in _RETRY_STATUSES and not rate_limited:
+                        break
+                    retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = type(e).__name__
+            
+            if attempt + 1 < GITHUB_MAX_ATTEMPTS:
+                delay = GITHUB_BACKOFF_SEC * 2 ** attempt
+                if retry_after and retry_after.isdigit():
+                    delay = float(retry_after)
+                await asyncio.sleep(delay)
+        
+        print(f"⚠️  GitHub request failed ({status}): {url}")
+        return None
+    
+    async def _list_prs_async(self, api_base: str, pages: int) -> List[Dict[str, Any]]:
+        """Request every PR page at once, at most PR_PAGE_CONCURRENCY in flight."""
+        limiter = GitHubRateLimiter()
+        semaphore = asyncio.Semaphore(PR_PAGE_CONCURRENCY)
+        
+        async def _page(session, page: int) -> Optional[List[Dict[str, Any]]]:
+            url = f"{api_base}/pulls?state=all&per_page={PR_PAGE_SIZE}&page={page}"
+            async with semaphore:
+                return await self._aget_json(session, url, limiter)
+        
+        async with self._client_session(PR_PAGE_CONCURRENCY) as session:
+            results = await asyncio.gather(*(_page(session, p) for p in range(1, pages + 1)))
+        
+        # Keep pages in order up to the first failed or empty one, as the
+        # sequential walk would have stopped there
+        all_prs = []
+        for page_prs in results:
+            if not page_prs:
+                break
+            all_prs.extend(page_prs)
+        return all_prs
+    
     def _pr_touches_module(self, pr: Dict[str, Any], module_filter: str) -> bool:
         """Check if a PR touches files in the specified module."""
         if "files" not in pr:
@@ -287,23 +460,144 @@ class RepositoryLearner:
         scored_prs.sort(key=lambda x: x[0], reverse=True)
         return [pr for score, pr in scored_prs[:max_prs]]
     
-    def _get_pr_reviews(self, api_base: str, pr_number: int) -> List[Dict[str, Any]]:
-        """Get all reviews for a specific PR."""
+    def _fetch_pr_details_cached(
+        self,
+        api_base: str,
+        prs: List[Dict[str, Any]],
+        include_reviews: bool,
+        include_comments: bool
+    ) -> Dict[int, Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """_fetch_pr_details, reusing results cached per (PR number, head SHA).
+        
+        Halves whose request failed come back as empty lists, and a PR with a
+        failed half is not cached, so it is refetched on the next run.
+        """
+        if self.cache_dir is None:
+            fetched = self._fetch_pr_details(
+                api_base, [pr["number"] for pr in prs], include_reviews, include_comments
+            )
+            return {n: (reviews or [], comments or []) for n, (reviews, comments) in fetched.items()}
+        
+        details = {}
+        cache_files = {}
+        for pr in prs:
+            sha = (pr.get("head") or {}).get("sha")
+            if not sha:
+                continue
+            cache_file = self.cache_dir / f"{pr['number']}_{sha}.json"
+            cache_files[pr["number"]] = cache_file
+            
+            cached = None if self.refresh_cache else self._read_pr_cache(cache_file)
+            if cached is None:
+                continue
+            if (include_reviews and "reviews" not in cached) or (include_comments and "comments" not in cached):
+                continue
+            details[pr["number"]] = (
+                cached.get("reviews", []) if include_reviews else [],
+                cached.get("comments", []) if include_comments else []
+            )
+        
+        missing = [pr["number"] for pr in prs if pr["number"] not in details]
+        if missing:
+            print(f"💾 {len(details)} PRs from cache, fetching {len(missing)}")
+            fetched = self._fetch_pr_details(api_base, missing, include_reviews, include_comments)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            
+            for pr_number, (reviews, comments) in fetched.items():
+                details[pr_number] = (reviews or [], comments or [])
+                cache_file = cache_files.get(pr_number)
+                # None marks a failed request; only fully fetched PRs are cached
+                if cache_file is None or reviews is None or comments is None:
+                    continue
+                entry = {}
+                if include_reviews:
+                    entry["reviews"] = reviews
+                if include_comments:
+                    entry["comments"] = comments
+                cache_file.write_text(json.dumps(entry))
+        
+        return details
+    
+    @staticmethod
+    def _read_pr_cache(cache_file: Path) -> Optional[Dict[str, Any]]:
+        """Load a per-PR cache entry, or None if missing, stale, or unreadable."""
+        try:
+            if time.time() - cache_file.stat().st_mtime > PR_CACHE_TTL_SEC:
+                return None
+            return json.loads(cache_file.read_bytes())
+        except (OSError, json.JSONDecodeError):
+            return None
+    
+    def _fetch_pr_details(
+        self,
+        api_base: str,
+        pr_numbers: List[int],
+        include_reviews: bool,
+        include_comments: bool
+    ) -> Dict[int, Tuple[Optional[List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]]]:
+        """Fetch (reviews, comments) for each PR, concurrently when possible.
+        
+        A half that was requested but failed is None; one not requested is [].
+        Falls back to sequential requests when aiohttp is unavailable or when
+        called from inside a running event loop.
+        """
+        if _can_run_async():
+            return asyncio.run(self._fetch_pr_details_async(
+                api_base, pr_numbers, include_reviews, include_comments
+            ))
+        
+        return {
+            pr_number: (
+                self._get_pr_reviews(api_base, pr_number) if include_reviews else [],
+                self._get_pr_comments(api_base, pr_number) if include_comments else []
+            )
+            for pr_number in pr_numbers
+        }
+    
+    async def _fetch_pr_details_async(
+        self,
+        api_base: str,
+        pr_numbers: List[int],
+        include_reviews: bool,
+        include_comments: bool
+    ) -> Dict[int, Tuple[Optional[List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]]]:
+        """Fetch reviews and comments for all PRs over one pooled aiohttp session."""
+        limiter = GitHubRateLimiter()
+        
+        async def _get(session, url: str) -> Optional[List[Dict[str, Any]]]:
+            return await self._aget_json(session, url, limiter)
+        
+        async def _none() -> List[Dict[str, Any]]:
+            return []
+        
+        async with self._client_session(GITHUB_MAX_CONCURRENCY) as session:
+            results = await asyncio.gather(*(
+                asyncio.gather(
+                    _get(session, f"{api_base}/pulls/{n}/reviews") if include_reviews else _none(),
+                    _get(session, f"{api_base}/pulls/{n}/comments") if include_comments else _none()
+                )
+                for n in pr_numbers
+            ))
+        
+        return {n: tuple(pair) for n, pair in zip(pr_numbers, results)}
+    
+    def _get_pr_reviews(self, api_base: str, pr_number: int) -> Optional[List[Dict[str, Any]]]:
+        """Get all reviews for a specific PR, or None if the request failed."""
         url = f"{api_base}/pulls/{pr_number}/reviews"
-        response = requests.get(url, headers=self.headers)
+        response = self._github_get(url)
         
         if response.status_code == 200:
             return response.json()
-        return []
+        return None
     
-    def _get_pr_comments(self, api_base: str, pr_number: int) -> List[Dict[str, Any]]:
-        """Get all comments for a specific PR."""
+    def _get_pr_comments(self, api_base: str, pr_number: int) -> Optional[List[Dict[str, Any]]]:
+        """Get all comments for a specific PR, or None if the request failed."""
         url = f"{api_base}/pulls/{pr_number}/comments"
-        response = requests.get(url, headers=self.headers)
+        response = self._github_get(url)
         
         if response.status_code == 200:
             return response.json()
-        return []
+        return None
     
     def _analyze_review_patterns(self, reviews: List[Dict[str, Any]], team_preferences: Dict[str, Any]):
         """Analyze patterns in PR reviews."""
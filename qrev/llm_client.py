@@ -25,6 +25,13 @@ class BaseLLMClient:
     def __init__(self):
         self.config = config
     
+    async def __aenter__(self):
+        """Hold backend resources open across several reviews (no-op by default)."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
+    
     async def review_hunk(self, hunk: Hunk, guidelines: Optional[str] = None) -> List[Finding]:
         """Review a code hunk using the configured LLM backend."""
         raise NotImplementedError("Subclasses must implement review_hunk")
@@ -415,6 +422,31 @@ class KiroClient(BaseLLMClient):
     def __init__(self):
         super().__init__()
         self.kiro_config = self.config.llm_config
+        # Shared HTTP session, open only while the client is used as an
+        # async context manager; otherwise each review opens its own
+        self._session = None
+    
+    async def __aenter__(self):
+        """Open one keep-alive HTTP session for all reviews in the block."""
+        import aiohttp
+        
+        timeout = aiohttp.ClientTimeout(total=self.config.review_timeout_sec)
+        self._session = aiohttp.ClientSession(timeout=timeout)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
+    
+    async def _post_chat(self, session, api_url: str, payload: dict, headers: dict) -> dict:
+        """POST a chat request to Kiro and return the decoded JSON response."""
+        async with session.post(api_url, json=payload, headers=headers) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise LLMClientError(f"Kiro API error {response.status}: {error_text}")
+            
+            return await response.json()
     
     async def review_hunk(self, hunk: Hunk, guidelines: Optional[str] = None) -> List[Finding]:
         """Review a code hunk using Kiro AI."""
@@ -459,16 +491,13 @@ class KiroClient(BaseLLMClient):
             api_url = f"{self.kiro_config['api_url'].rstrip('/')}/api/chat"
             logger.debug(f"Calling Kiro API at {api_url} for {hunk.file_path}")
             
-            timeout = aiohttp.ClientTimeout(total=self.config.review_timeout_sec)
-            
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(api_url, json=payload, headers=headers) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise LLMClientError(f"Kiro API error {response.status}: {error_text}")
-                    
-                    response_data = await response.json()
-                    logger.info(f"Kiro response received for {hunk.file_path}")
+            if self._session is not None:
+                response_data = await self._post_chat(self._session, api_url, payload, headers)
+            else:
+                timeout = aiohttp.ClientTimeout(total=self.config.review_timeout_sec)
+                async with aiohttp.ClientSession(timeout=timeout) as session:
+                    response_data = await self._post_chat(session, api_url, payload, headers)
+            logger.info(f"Kiro response received for {hunk.file_path}")
             
             # Extract content from response
             # Kiro might return different response formats, handle common ones
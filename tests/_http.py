@@ -0,0 +1,67 @@
+"""Shared HTTP session for the test and demo scripts that call a live API."""
+
+import atexit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class _Retry(Retry):
+    """Retry that only repeats a POST when it was throttled (429).
+
+    A 429 means the request was turned away unprocessed; a 502/503/504 may
+    come after the server already acted on it, and the POSTs here (reviews,
+    comments, standards) are not idempotent.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method.upper() == "POST" and status_code != 429:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+# Retry throttled/unavailable responses, waiting out any Retry-After header;
+# connection failures still surface immediately
+RETRY = _Retry(
+    total=5,
+    connect=0,
+    read=0,
+    backoff_factor=0.5,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+
+def make_session() -> requests.Session:
+    """Create a keep-alive session with pooled, retrying adapters and JSON headers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=64, pool_block=False, max_retries=RETRY)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json", "Accept": "application/json"})
+    return session
+
+
+def make_aio_session(base_url=None):
+    """Create an aiohttp session with a pooled, DNS-caching connector.
+
+    Must be called from a running event loop.
+    """
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(
+        limit=32,
+        limit_per_host=32,
+        use_dns_cache=True,
+        ttl_dns_cache=300,
+        keepalive_timeout=30,
+    )
+    return aiohttp.ClientSession(base_url=base_url, connector=connector)
+
+
+# One pool per process, shared by every script that imports it
+SESSION = make_session()
+atexit.register(SESSION.close)
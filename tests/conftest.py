@@ -0,0 +1,48 @@
+"""Shared pytest fixtures for QReviewer tests."""
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from qrev.api.app import app
+
+from ._http import make_aio_session, make_session
+
+# Server the live-API tests talk to (start it with `make dev`)
+LIVE_API_URL = "http://localhost:8000"
+
+
+@pytest.fixture(scope="session")
+def http():
+    """Keep-alive HTTP session shared by every live-API test in the run."""
+    session = make_session()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run anyio-marked tests on asyncio, sharing one loop per session."""
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def aclient(anyio_backend):
+    """Async in-process API client for tests that chain endpoint calls."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+async def aio_http(anyio_backend):
+    """aiohttp session for async live-API tests that gather independent calls."""
+    async with make_aio_session(LIVE_API_URL) as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def client():
+    """In-process API client; app startup runs once per test session."""
+    with TestClient(app) as c:
+        yield c
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """Demo script for QReviewer functionality."""
 
+import hashlib
 import json
+import pickle
 from pathlib import Path
 
 # Add current directory to path
@@ -12,6 +14,40 @@ from qrev.models import PRInfo, PRFilePatch, PRDiff, Hunk, Finding, FindingsRepo
 from qrev.diff import extract_hunks_from_files
 from qrev.q_client import review_hunk, apply_security_heuristics
 
+# Parsed hunks are cached here, keyed by a hash of the file paths and patches
+HUNK_CACHE_DIR = Path.home() / ".cache" / "qrev" / "hunks"
+
+# Bump when Hunk or hunk extraction changes, so older pickles are not reused
+HUNK_CACHE_VERSION = 1
+
+
+def extract_hunks_cached(files):
+    """Extract hunks, reusing a pickled result for identical patch content."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{HUNK_CACHE_VERSION}\0".encode())
+    for file_patch in files:
+        digest.update(file_patch.path.encode())
+        digest.update(b"\0")
+        digest.update((file_patch.patch or "").encode())
+        digest.update(b"\0")
+    cache_file = HUNK_CACHE_DIR / f"{digest.hexdigest()}.pkl"
+    
+    try:
+        with open(cache_file, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        # Unpickling can fail in many ways (truncated file, renamed or changed
+        # classes); any unreadable entry is just recomputed and overwritten
+        pass
+    
+    hunks = extract_hunks_from_files(files)
+    HUNK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(cache_file, "wb") as f:
+        pickle.dump(hunks, f)
+    return hunks
+
 
 def create_demo_data():
     """Create demo PR diff data."""
@@ -66,7 +102,7 @@ def create_demo_data():
     
     # Save demo data
     with open("demo-pr-diff.json", "w") as f:
-        json.dump(pr_diff.dict(), f, indent=2)
+        f.write(pr_diff.model_dump_json(indent=2))
     
     print("✅ Demo PR diff saved to demo-pr-diff.json")
     return pr_diff
@@ -76,14 +112,17 @@ def demo_review_process():
     """Demonstrate the review process."""
     print("\n🔍 Demonstrating review process...")
     
-    # Load demo data
+    # Load demo data (written by create_demo_data, so skip re-validation)
     with open("demo-pr-diff.json", "r") as f:
         pr_diff_data = json.load(f)
-        pr_diff = PRDiff.parse_obj(pr_diff_data)
+    pr_diff = PRDiff.model_construct(
+        pr=PRInfo.model_construct(**pr_diff_data["pr"]),
+        files=[PRFilePatch.model_construct(**f) for f in pr_diff_data["files"]]
+    )
     
     # Extract hunks
     print("📝 Extracting code hunks...")
-    hunks = extract_hunks_from_files(pr_diff.files)
+    hunks = extract_hunks_cached(pr_diff.files)
     print(f"✅ Found {len(hunks)} hunks to review")
     
     # Review each hunk
@@ -114,7 +153,7 @@ def demo_review_process():
     
     # Save findings
     with open("demo-findings.json", "w") as f:
-        json.dump(findings_report.dict(), f, indent=2)
+        f.write(findings_report.model_dump_json(indent=2))
     
     print("✅ Demo findings saved to demo-findings.json")
     
@@ -10,21 +10,49 @@ This script demonstrates the complete AI-powered learning system:
 """
 
 import os
-import requests
 import json
+import sys
 import time
 from typing import Dict, Any, List
 
+# Shared keep-alive session (pooled, retrying, JSON headers) from tests/_http.py
+try:
+    from ._http import SESSION
+except ImportError:  # run directly as a script
+    from _http import SESSION
+
+# Static request body, JSON-encoded once at import instead of on every call
+TARGET_REPO = "https://github.com/facebook/react"
+_LEARN_PAYLOAD_BYTES = json.dumps({
+    "repositoryUrl": TARGET_REPO,
+    "maxPRs": 20,  # Analyze more PRs for better learning
+    "includeComments": True,
+    "includeReviews": True
+}).encode()
+
+# Output is buffered and written once per section instead of once per line
+_output_buffer: List[str] = []
+out = _output_buffer.append
+
+def flush_output():
+    """Write all buffered lines to stdout in a single call."""
+    if _output_buffer:
+        sys.stdout.write("\n".join(_output_buffer) + "\n")
+        sys.stdout.flush()
+        _output_buffer.clear()
+
 def print_header(title: str):
     """Print a formatted header."""
-    print("\n" + "=" * 60)
-    print(f"🚀 {title}")
-    print("=" * 60)
+    flush_output()
+    out("\n" + "=" * 60)
+    out(f"🚀 {title}")
+    out("=" * 60)
 
 def print_section(title: str):
     """Print a formatted section."""
-    print(f"\n📋 {title}")
-    print("-" * 40)
+    flush_output()
+    out(f"\n📋 {title}")
+    out("-" * 40)
 
 def test_ai_learning_workflow():
     """Demonstrate the complete AI learning workflow."""
@@ -34,126 +62,123 @@ def test_ai_learning_workflow():
     # Step 1: Learn from a repository with rich history
     print_section("Step 1: Learning from Repository History")
     
-    target_repo = "https://github.com/facebook/react"
-    print(f"🎯 Target repository: {target_repo}")
-    print("   This repository has thousands of PRs and reviews")
-    print("   We'll analyze recent PRs to learn patterns")
+    target_repo = TARGET_REPO
+    out(f"🎯 Target repository: {target_repo}")
+    out("   This repository has thousands of PRs and reviews")
+    out("   We'll analyze recent PRs to learn patterns")
     
     try:
         # Start the learning process
-        print("\n🤖 Starting AI learning process...")
-        response = requests.post(
+        out("\n🤖 Starting AI learning process...")
+        flush_output()
+        response = SESSION.post(
             "http://localhost:8000/learn_from_repository",
-            json={
-                "repositoryUrl": target_repo,
-                "maxPRs": 20,  # Analyze more PRs for better learning
-                "includeComments": True,
-                "includeReviews": True
-            },
+            data=_LEARN_PAYLOAD_BYTES,
             timeout=60
         )
         
         if response.status_code == 200:
             result = response.json()
-            print(f"✅ Learning completed successfully!")
-            print(f"   📊 Analyzed: {result['summary']['total_prs']} PRs")
-            print(f"   🔍 Reviews: {result['summary']['total_reviews']}")
-            print(f"   💬 Comments: {result['summary']['total_comments']}")
-            print(f"   📁 Results saved to: {result['outputFile']}")
+            out(f"✅ Learning completed successfully!")
+            out(f"   📊 Analyzed: {result['summary']['total_prs']} PRs")
+            out(f"   🔍 Reviews: {result['summary']['total_reviews']}")
+            out(f"   💬 Comments: {result['summary']['total_comments']}")
+            out(f"   📁 Results saved to: {result['outputFile']}")
             
             # Step 2: Analyze what was learned
             print_section("Step 2: Analysis of Learned Patterns")
             
             if result['learnedStandards']:
-                print("🎯 Generated Standards:")
+                out("🎯 Generated Standards:")
                 for name, standard in result['learnedStandards'].items():
-                    print(f"   📋 {name}")
-                    print(f"      Description: {standard.get('description', 'N/A')}")
-                    print(f"      Categories: {', '.join(standard.get('categories', []))}")
-                    print(f"      Version: {standard.get('version', 'N/A')}")
+                    out(f"   📋 {name}")
+                    out(f"      Description: {standard.get('description', 'N/A')}")
+                    out(f"      Categories: {', '.join(standard.get('categories', []))}")
+                    out(f"      Version: {standard.get('version', 'N/A')}")
             else:
-                print("🎯 No standards generated yet")
+                out("🎯 No standards generated yet")
             
             if result['commonIssues']:
-                print("\n🚨 Common Issues Identified:")
+                out("\n🚨 Common Issues Identified:")
                 for i, issue in enumerate(result['commonIssues'][:5], 1):
-                    print(f"   {i}. {issue.get('category', 'Unknown')}: {issue.get('message', 'N/A')}")
-                    print(f"      Severity: {issue.get('severity', 'Unknown')}")
-                    print(f"      Confidence: {issue.get('confidence', 0):.1f}")
+                    out(f"   {i}. {issue.get('category', 'Unknown')}: {issue.get('message', 'N/A')}")
+                    out(f"      Severity: {issue.get('severity', 'Unknown')}")
+                    out(f"      Confidence: {issue.get('confidence', 0):.1f}")
             else:
-                print("\n🚨 No common issues identified")
+                out("\n🚨 No common issues identified")
             
             if result['teamPreferences']:
-                print("\n👥 Team Preferences Learned:")
+                out("\n👥 Team Preferences Learned:")
                 prefs = result['teamPreferences']
                 if 'review_style' in prefs:
-                    print("   Review Style:")
+                    out("   Review Style:")
                     for style, count in prefs['review_style'].items():
-                        print(f"      {style}: {count}")
+                        out(f"      {style}: {count}")
             
             # Step 3: Show how this improves future reviews
             print_section("Step 3: How This Improves Future Reviews")
             
-            print("🔮 The AI system now understands:")
-            print("   • Common patterns in this codebase")
-            print("   • Team review preferences")
-            print("   • File-specific issues")
-            print("   • Severity distributions")
+            out("🔮 The AI system now understands:")
+            out("   • Common patterns in this codebase")
+            out("   • Team review preferences")
+            out("   • File-specific issues")
+            out("   • Severity distributions")
             
-            print("\n💡 Benefits for future reviews:")
-            print("   • More accurate issue detection")
-            print("   • Context-aware suggestions")
-            print("   • Team-specific standards")
-            print("   • Continuous improvement")
+            out("\n💡 Benefits for future reviews:")
+            out("   • More accurate issue detection")
+            out("   • Context-aware suggestions")
+            out("   • Team-specific standards")
+            out("   • Continuous improvement")
             
             # Step 4: Demonstrate continuous learning
             print_section("Step 4: Continuous Learning Capabilities")
             
-            print("🔄 The system can:")
-            print("   • Learn from new PRs automatically")
-            print("   • Update standards based on new patterns")
-            print("   • Adapt to team changes over time")
-            print("   • Generate reports on learning progress")
+            out("🔄 The system can:")
+            out("   • Learn from new PRs automatically")
+            out("   • Update standards based on new patterns")
+            out("   • Adapt to team changes over time")
+            out("   • Generate reports on learning progress")
             
             # Step 5: Show practical applications
             print_section("Step 5: Practical Applications")
             
-            print("🎯 Use Cases:")
-            print("   • Onboarding new team members")
-            print("   • Standardizing review processes")
-            print("   • Identifying recurring issues")
-            print("   • Improving code quality metrics")
-            print("   • Training AI models for code review")
+            out("🎯 Use Cases:")
+            out("   • Onboarding new team members")
+            out("   • Standardizing review processes")
+            out("   • Identifying recurring issues")
+            out("   • Improving code quality metrics")
+            out("   • Training AI models for code review")
             
         else:
-            print(f"❌ Learning failed: {response.status_code}")
-            print(f"   Error: {response.text}")
+            out(f"❌ Learning failed: {response.status_code}")
+            out(f"   Error: {response.text}")
             
     except Exception as e:
-        print(f"❌ Exception during learning: {str(e)}")
+        out(f"❌ Exception during learning: {str(e)}")
     
     # Step 6: Show how to use the learned knowledge
     print_section("Step 6: Using Learned Knowledge")
     
-    print("🔧 To use the learned knowledge:")
-    print("   1. The system automatically applies learned patterns")
-    print("   2. New reviews benefit from historical insights")
-    print("   3. Standards can be exported and shared")
-    print("   4. Learning results can be analyzed further")
+    out("🔧 To use the learned knowledge:")
+    out("   1. The system automatically applies learned patterns")
+    out("   2. New reviews benefit from historical insights")
+    out("   3. Standards can be exported and shared")
+    out("   4. Learning results can be analyzed further")
     
-    print("\n📚 Next Steps:")
-    print("   • Run learning on your own repositories")
-    print("   • Customize learning parameters")
-    print("   • Export and share learned standards")
-    print("   • Integrate with existing review workflows")
+    out("\n📚 Next Steps:")
+    out("   • Run learning on your own repositories")
+    out("   • Customize learning parameters")
+    out("   • Export and share learned standards")
+    out("   • Integrate with existing review workflows")
     
     print_header("AI Learning Workflow Complete!")
-    print("🎉 The system has successfully demonstrated:")
-    print("   ✅ Repository analysis and pattern extraction")
-    print("   ✅ AI-powered learning from review history")
-    print("   ✅ Standard generation and team preference learning")
-    print("   ✅ Continuous improvement capabilities")
-    print("   ✅ Practical applications for code review")
+    out("🎉 The system has successfully demonstrated:")
+    out("   ✅ Repository analysis and pattern extraction")
+    out("   ✅ AI-powered learning from review history")
+    out("   ✅ Standard generation and team preference learning")
+    out("   ✅ Continuous improvement capabilities")
+    out("   ✅ Practical applications for code review")
+    flush_output()
 
 if __name__ == "__main__":
     test_ai_learning_workflow()
@@ -3,24 +3,65 @@
 Test script to demonstrate QReviewer's new AI-powered repository learning functionality.
 """
 
+import pytest
 import requests
 import json
 import time
+import types
+from functools import lru_cache
 
 # API base URL
 BASE_URL = "http://localhost:8000"
 
-def test_learn_from_repository():
+# Talks to a running QReviewer server; excluded from the default pytest run
+pytestmark = pytest.mark.integration
+
+# Shared keep-alive session (pooled, retrying, JSON headers) from tests/_http.py
+try:
+    from ._http import SESSION
+except ImportError:  # run directly as a script
+    from _http import SESSION
+
+# Static request bodies, JSON-encoded once at import instead of on every call
+LEARN_PAYLOAD = {
+    "repositoryUrl": "https://github.com/bfalkowski/QReviewer",
+    "maxPRs": 50,  # Analyze up to 50 PRs
+    "includeComments": True,
+    "includeReviews": True,
+    "outputFile": "qreviewer_learning_results.json"
+}
+_LEARN_PAYLOAD_BYTES = json.dumps(LEARN_PAYLOAD).encode()
+_EMPTY_PAYLOAD_BYTES = b"{}"
+
+# Compliance status indicators
+COMPLIANCE_EMOJI = types.MappingProxyType({"PASSED": "🟢", "WARNING": "🟡", "FAILED": "🔴"})
+
+# Bumped whenever server-side standards change so cached lookups are refetched
+_STANDARDS_VERSION = 0
+
+@lru_cache(maxsize=16)
+def _get_standards_cached(http: requests.Session, version: int) -> tuple:
+    """Fetch the available standard names, cached per standards version."""
+    response = http.post(f"{BASE_URL}/get_standards", data=_EMPTY_PAYLOAD_BYTES)
+    response.raise_for_status()
+    return tuple(response.json()['availableStandards'])
+
+def _invalidate_standards_cache():
+    """Drop cached standards after the server's standards were mutated."""
+    global _STANDARDS_VERSION
+    _STANDARDS_VERSION += 1
+    _get_standards_cached.cache_clear()
+
+@pytest.fixture(scope="module")
+def learning_results_file(http):
+    """Learn from the repository once and share the results file."""
+    return test_learn_from_repository(http)
+
+def test_learn_from_repository(http):
     """Test learning from repository review history."""
     print("🤖 Testing AI-powered repository learning...")
     
-    payload = {
-        "repositoryUrl": "https://github.com/bfalkowski/QReviewer",
-        "maxPRs": 50,  # Analyze up to 50 PRs
-        "includeComments": True,
-        "includeReviews": True,
-        "outputFile": "qreviewer_learning_results.json"
-    }
+    payload = LEARN_PAYLOAD
     
     print(f"📚 Learning from repository: {payload['repositoryUrl']}")
     print(f"   - Max PRs to analyze: {payload['maxPRs']}")
@@ -34,7 +75,7 @@ def test_learn_from_repository():
     print("   It's a one-time task that will give QReviewer 'experience' from your team's review history.")
     print()
     
-    response = requests.post(f"{BASE_URL}/learn_from_repository", json=payload)
+    response = http.post(f"{BASE_URL}/learn_from_repository", data=_LEARN_PAYLOAD_BYTES)
     
     if response.status_code == 200:
         result = response.json()
@@ -47,9 +88,11 @@ def test_learn_from_repository():
         print(f"   - Message: {result['message']}")
         
         print("\n🧠 What the AI learned:")
-        print(f"   - Learned standards: {len(result['learnedStandards'])}")
-        for std_name, std_data in result['learnedStandards'].items():
-            print(f"     • {std_name}: {len(std_data['rules'])} rules")
+        learned_standards = result['learnedStandards']
+        print(f"   - Learned standards: {len(learned_standards)}")
+        for std_name, std_data in learned_standards.items():
+            rules = std_data.get('rules', ())
+            print(f"     • {std_name}: {len(rules)} rules")
         
         print(f"   - Common issues identified: {len(result['commonIssues'])}")
         print(f"   - Team preferences learned: {len(result['teamPreferences'])} categories")
@@ -61,7 +104,7 @@ def test_learn_from_repository():
         print(f"   Error: {response.text}")
         return None
 
-def test_apply_learned_standards(learning_results_file):
+def test_apply_learned_standards(http, learning_results_file):
     """Test applying the learned standards to the system."""
     if not learning_results_file:
         print("❌ No learning results file to apply")
@@ -77,7 +120,7 @@ def test_apply_learned_standards(learning_results_file):
     print(f"📋 Applying learned standards from: {learning_results_file}")
     print("   This will create new standards based on your repository's review patterns!")
     
-    response = requests.post(f"{BASE_URL}/apply_learned_standards", json=payload)
+    response = http.post(f"{BASE_URL}/apply_learned_standards", json=payload)
     
     if response.status_code == 200:
         result = response.json()
@@ -86,6 +129,7 @@ def test_apply_learned_standards(learning_results_file):
         print(f"   - New standards created: {result['standardsCreated']}")
         print(f"   - Existing standards updated: {result['standardsUpdated']}")
         print(f"   - Message: {result['message']}")
+        _invalidate_standards_cache()
         
         if result['standardsApplied']:
             print("\n📚 New standards available:")
@@ -96,16 +140,19 @@ def test_apply_learned_standards(learning_results_file):
         print(f"❌ Failed to apply learned standards: {response.status_code}")
         print(f"   Error: {response.text}")
 
-def test_enhanced_review_with_learned_standards():
+def test_enhanced_review_with_learned_standards(http):
     """Test enhanced review using the newly learned standards."""
     print("\n🧪 Testing enhanced review with learned standards...")
     
     # First, get available standards to see our new learned ones
-    response = requests.post(f"{BASE_URL}/get_standards", json={})
+    try:
+        available_standards = _get_standards_cached(http, _STANDARDS_VERSION)
+    except requests.HTTPError as e:
+        available_standards = None
+        print(f"❌ Failed to get standards: {e.response.status_code}")
     
-    if response.status_code == 200:
-        result = response.json()
-        learned_standards = [name for name in result['availableStandards'] if name.startswith('learned_')]
+    if available_standards is not None:
+        learned_standards = [name for name in available_standards if name.startswith('learned_')]
         
         if learned_standards:
             print(f"🎯 Found {len(learned_standards)} learned standards: {', '.join(learned_standards)}")
@@ -121,7 +168,7 @@ def test_enhanced_review_with_learned_standards():
             print(f"📤 Running enhanced review with learned standards: {payload['standards']}")
             print("   - Mode: learning (will provide insights based on repository history)")
             
-            response = requests.post(f"{BASE_URL}/enhanced_review", json=payload)
+            response = http.post(f"{BASE_URL}/enhanced_review", json=payload)
             
             if response.status_code == 200:
                 result = response.json()
@@ -132,7 +179,7 @@ def test_enhanced_review_with_learned_standards():
                 
                 print("\n📊 Compliance Status:")
                 for std, status in result['complianceStatus'].items():
-                    emoji = {"PASSED": "🟢", "WARNING": "🟡", "FAILED": "🔴"}.get(status, "⚪")
+                    emoji = COMPLIANCE_EMOJI.get(status, "⚪")
                     print(f"   {emoji} {std}: {status}")
                 
                 print("\n💡 AI-Generated Recommendations:")
@@ -148,8 +195,54 @@ def test_enhanced_review_with_learned_standards():
                 print(f"   Error: {response.text}")
         else:
             print("❌ No learned standards found")
-    else:
-        print(f"❌ Failed to get standards: {response.status_code}")
+
+def _load_learning_summary(learning_results_file):
+    """Load only the fields shown by the summary.
+    
+    Streams the file with ijson when it is installed so just the first few
+    common issues are held in memory; falls back to json.load otherwise.
+    """
+    try:
+        import ijson
+    except ImportError:
+        with open(learning_results_file, 'r') as f:
+            results = json.load(f)
+        return {
+            "repository": results['repository'],
+            "summary": results['summary'],
+            "learned_standards": results['learned_standards'],
+            "common_issues_count": len(results['common_issues']),
+            "top_common_issues": results['common_issues'][:5],
+            "common_categories": results['team_preferences'].get('common_categories', {})
+        }
+    
+    def first_item(f, prefix, default=None):
+        f.seek(0)
+        return next(ijson.items(f, prefix, use_float=True), default)
+    
+    with open(learning_results_file, 'rb') as f:
+        repository = first_item(f, 'repository')
+        summary = first_item(f, 'summary')
+        learned_standards = first_item(f, 'learned_standards', {})
+        
+        f.seek(0)
+        top_common_issues = []
+        common_issues_count = 0
+        for issue in ijson.items(f, 'common_issues.item', use_float=True):
+            if common_issues_count < 5:
+                top_common_issues.append(issue)
+            common_issues_count += 1
+        
+        common_categories = first_item(f, 'team_preferences.common_categories', {})
+    
+    return {
+        "repository": repository,
+        "summary": summary,
+        "learned_standards": learned_standards,
+        "common_issues_count": common_issues_count,
+        "top_common_issues": top_common_issues,
+        "common_categories": common_categories
+    }
 
 def show_learning_results_summary(learning_results_file):
     """Show a summary of what was learned."""
@@ -157,8 +250,7 @@ def show_learning_results_summary(learning_results_file):
         return
     
     try:
-        with open(learning_results_file, 'r') as f:
-            results = json.load(f)
+        results = _load_learning_summary(learning_results_file)
         
         print("\n📊 Learning Results Summary")
         print("=" * 50)
@@ -167,18 +259,21 @@ def show_learning_results_summary(learning_results_file):
         print(f"Total reviews: {results['summary']['total_reviews']}")
         print(f"Total comments: {results['summary']['total_comments']}")
         
-        print(f"\n🧠 Learned Standards: {len(results['learned_standards'])}")
-        for std_name, std_data in results['learned_standards'].items():
-            print(f"  • {std_name}: {len(std_data['rules'])} rules")
-            print(f"    Categories: {', '.join(std_data['categories'])}")
+        learned_standards = results['learned_standards']
+        print(f"\n🧠 Learned Standards: {len(learned_standards)}")
+        for std_name, std_data in learned_standards.items():
+            rules = std_data.get('rules', ())
+            categories = std_data.get('categories', ())
+            print(f"  • {std_name}: {len(rules)} rules")
+            print(f"    Categories: {', '.join(categories)}")
         
-        print(f"\n🔍 Common Issues: {len(results['common_issues'])}")
-        for i, issue in enumerate(results['common_issues'][:5], 1):  # Show top 5
+        print(f"\n🔍 Common Issues: {results['common_issues_count']}")
+        for i, issue in enumerate(results['top_common_issues'], 1):  # Show top 5
             print(f"  {i}. {issue['category']}: {issue['message']}")
             print(f"     Frequency: {issue['frequency']}, Confidence: {issue['confidence']:.2f}")
         
         print(f"\n👥 Team Preferences:")
-        for category, count in results['team_preferences'].get('common_categories', {}).items():
+        for category, count in results['common_categories'].items():
             print(f"  • {category}: {count} mentions")
         
         print(f"\n💾 Results saved to: {learning_results_file}")
@@ -196,17 +291,17 @@ def main():
     print()
     
     # Step 1: Learn from repository
-    learning_results_file = test_learn_from_repository()
+    learning_results_file = test_learn_from_repository(SESSION)
     
     if learning_results_file:
         # Step 2: Show what was learned
         show_learning_results_summary(learning_results_file)
         
         # Step 3: Apply learned standards
-        test_apply_learned_standards(learning_results_file)
+        test_apply_learned_standards(SESSION, learning_results_file)
         
         # Step 4: Test enhanced review with learned standards
-        test_enhanced_review_with_learned_standards()
+        test_enhanced_review_with_learned_standards(SESSION)
         
         print("\n🎉 AI Learning Test Completed!")
         print()
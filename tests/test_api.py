@@ -1,16 +1,14 @@
 """Tests for QReviewer API endpoints."""
 
+import asyncio
+import types
+
 import pytest
-from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock, AsyncMock
-from qrev.api.app import app
 from qrev.models import Finding
 
-# Create test client
-client = TestClient(app)
-
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_finding():
     """Create a mock Finding for testing."""
     return Finding(
@@ -25,16 +23,25 @@ def mock_finding():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def mock_finding_dict(mock_finding):
+    """Serialized mock Finding, dumped once per module."""
+    return mock_finding.model_dump()
+
+
+@pytest.fixture(scope="session")
 def mock_diff_data():
-    """Create mock diff data for testing."""
-    return {
+    """Create mock diff data for testing.
+
+    Shared across the session, so it is read-only; copy before mutating.
+    """
+    return types.MappingProxyType({
         "pr": {
             "url": "https://github.com/test/repo/pull/123",
             "number": 123,
             "repo": "test/repo"
         },
-        "files": [
+        "files": (
             {
                 "path": "test.py",
                 "status": "modified",
@@ -42,15 +49,25 @@ def mock_diff_data():
                 "additions": 1,
                 "deletions": 1,
                 "sha": "abc123"
-            }
-        ]
-    }
+            },
+        )
+    })
+
+
+@pytest.fixture
+def patched_async(monkeypatch, mock_diff_data, mock_finding):
+    """Replace the async fetch and review stages with AsyncMocks."""
+    mock_fetch = AsyncMock(return_value=mock_diff_data)
+    mock_review = AsyncMock(return_value=[mock_finding])
+    monkeypatch.setattr('qrev.api.app.fetch_pr_diff_async', mock_fetch)
+    monkeypatch.setattr('qrev.api.app.review_hunks_async', mock_review)
+    return mock_fetch, mock_review
 
 
 class TestHealthEndpoint:
     """Test health check endpoint."""
     
-    def test_health_check(self):
+    def test_health_check(self, client):
         """Test health check endpoint returns healthy status."""
         response = client.get("/health")
         assert response.status_code == 200
@@ -62,7 +79,7 @@ class TestHealthEndpoint:
 class TestRootEndpoint:
     """Test root endpoint."""
     
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, client):
         """Test root endpoint returns HTML with API information."""
         response = client.get("/")
         assert response.status_code == 200
@@ -73,20 +90,15 @@ class TestRootEndpoint:
 class TestReviewEndpoint:
     """Test main review endpoint."""
     
-    @patch('qrev.api.app.fetch_pr_diff_async')
-    @patch('qrev.api.app.review_hunks_async')
-    def test_review_endpoint_success(self, mock_review, mock_fetch, mock_finding, mock_diff_data):
+    @pytest.mark.anyio
+    async def test_review_endpoint_success(self, aclient, patched_async):
         """Test successful review endpoint call."""
-        # Mock the async functions
-        mock_fetch.return_value = mock_diff_data
-        mock_review.return_value = [mock_finding]
-        
         # Test request
         request_data = {
             "prUrl": "https://github.com/test/repo/pull/123"
         }
         
-        response = client.post("/review", json=request_data)
+        response = await aclient.post("/review", json=request_data)
         assert response.status_code == 200
         
         data = response.json()
@@ -97,22 +109,17 @@ class TestReviewEndpoint:
         assert len(data["findings"]) == 1
         assert data["findings"][0]["file"] == "test.py"
     
-    def test_review_endpoint_missing_url(self):
-        """Test review endpoint with missing PR URL."""
-        request_data = {}
-        response = client.post("/review", json=request_data)
-        assert response.status_code == 422  # Validation error
-    
-    @patch('qrev.api.app.fetch_pr_diff_async')
-    def test_review_endpoint_github_error(self, mock_fetch):
+    @pytest.mark.anyio
+    async def test_review_endpoint_github_error(self, aclient, patched_async):
         """Test review endpoint with GitHub API error."""
+        mock_fetch, _ = patched_async
         mock_fetch.side_effect = Exception("GitHub API error")
         
         request_data = {
             "prUrl": "https://github.com/test/repo/pull/123"
         }
         
-        response = client.post("/review", json=request_data)
+        response = await aclient.post("/review", json=request_data)
         assert response.status_code == 500
         
         data = response.json()
@@ -123,8 +130,8 @@ class TestReviewEndpoint:
 class TestFetchPREndpoint:
     """Test fetch PR endpoint."""
     
-    @patch('qrev.api.app.fetch_pr_diff_async')
-    def test_fetch_pr_success(self, mock_fetch, mock_diff_data):
+    @patch('qrev.api.app.fetch_pr_diff_async', new_callable=AsyncMock)
+    def test_fetch_pr_success(self, mock_fetch, client, mock_diff_data):
         """Test successful PR fetch."""
         mock_fetch.return_value = mock_diff_data
         
@@ -138,24 +145,18 @@ class TestFetchPREndpoint:
         data = response.json()
         assert "diffJson" in data
         assert data["diffJson"]["pr"]["number"] == 123
-    
-    def test_fetch_pr_missing_url(self):
-        """Test fetch PR with missing URL."""
-        request_data = {}
-        response = client.post("/fetch_pr", json=request_data)
-        assert response.status_code == 422
 
 
 class TestReviewHunksEndpoint:
     """Test review hunks endpoint."""
     
-    @patch('qrev.api.app.review_hunks_async')
-    def test_review_hunks_success(self, mock_review, mock_finding, mock_diff_data):
+    @patch('qrev.api.app.review_hunks_async', new_callable=AsyncMock)
+    def test_review_hunks_success(self, mock_review, client, mock_finding, mock_diff_data):
         """Test successful hunks review."""
         mock_review.return_value = [mock_finding]
         
         request_data = {
-            "diffJson": mock_diff_data
+            "diffJson": dict(mock_diff_data)
         }
         
         response = client.post("/review_hunks", json=request_data)
@@ -164,21 +165,15 @@ class TestReviewHunksEndpoint:
         data = response.json()
         assert "findings" in data
         assert len(data["findings"]) == 1
-    
-    def test_review_hunks_missing_diff(self):
-        """Test review hunks with missing diff data."""
-        request_data = {}
-        response = client.post("/review_hunks", json=request_data)
-        assert response.status_code == 422
 
 
 class TestRenderReportEndpoint:
     """Test render report endpoint."""
     
-    def test_render_report_success(self, mock_finding):
+    def test_render_report_success(self, client, mock_finding_dict):
         """Test successful report rendering."""
         request_data = {
-            "findings": [mock_finding.model_dump()]
+            "findings": [mock_finding_dict]
         }
         
         response = client.post("/render_report", json=request_data)
@@ -189,7 +184,7 @@ class TestRenderReportEndpoint:
         assert "reportHash" in data
         assert "QReviewer Report" in data["reportHtml"]
     
-    def test_render_report_empty_findings(self):
+    def test_render_report_empty_findings(self, client):
         """Test report rendering with no findings."""
         request_data = {
             "findings": []
@@ -205,10 +200,10 @@ class TestRenderReportEndpoint:
 class TestScoreEndpoint:
     """Test score endpoint."""
     
-    def test_score_success(self, mock_finding):
+    def test_score_success(self, client, mock_finding_dict):
         """Test successful scoring."""
         request_data = {
-            "findings": [mock_finding.model_dump()]
+            "findings": [mock_finding_dict]
         }
         
         response = client.post("/score", json=request_data)
@@ -219,7 +214,7 @@ class TestScoreEndpoint:
         assert isinstance(data["score"], float)
         assert data["score"] > 0
     
-    def test_score_no_findings(self):
+    def test_score_no_findings(self, client):
         """Test scoring with no findings."""
         request_data = {
             "findings": []
@@ -232,31 +227,96 @@ class TestScoreEndpoint:
         assert data["score"] == 0.0
 
 
-class TestErrorHandling:
-    """Test error handling across endpoints."""
+class TestLearnFromRepositoryEndpoint:
+    """Test single-repository learning endpoint."""
+    
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'test-token'})
+    @patch('qrev.learning.RepositoryLearner')
+    @patch('qrev.learning.learn_from_repository')
+    def test_learning_runs_off_event_loop(self, mock_learn, mock_learner_cls, client):
+        """Test that blocking GitHub calls (and rate-limit sleeps) don't run on the loop."""
+        context = MagicMock(
+            repository="test/repo", total_prs=2, total_reviews=3, total_comments=4,
+            common_issues=[], team_preferences={}
+        )
+        
+        def learn(**kwargs):
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            return context
+        
+        mock_learn.side_effect = learn
+        mock_learner_cls.return_value.generate_learned_standards.return_value = {}
+        
+        response = client.post("/learn_from_repository", json={"repositoryUrl": "https://github.com/test/repo"})
+        assert response.status_code == 200
+        assert response.json()["summary"]["total_prs"] == 2
+        mock_learn.assert_called_once()
+
+
+class TestLearnFromRepositoriesEndpoint:
+    """Test batched repository learning endpoint."""
+    
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'test-token'})
+    @patch('qrev.learning.RepositoryLearner')
+    def test_learn_from_repositories_shares_learner(self, mock_learner_cls, client):
+        """Test that one learner serves every repository and failures stay per-repo."""
+        learner = mock_learner_cls.return_value
+        context = MagicMock(
+            repository="test/repo", total_prs=2, total_reviews=3, total_comments=4,
+            common_issues=[], team_preferences={}
+        )
+        learner.analyze_repository.side_effect = [context, Exception("GitHub API error")]
+        learner.generate_learned_standards.return_value = {}
+        
+        request_data = {
+            "repositoryUrls": ["https://github.com/test/repo", "https://github.com/test/broken"],
+            "maxPRs": 5
+        }
+        
+        response = client.post("/learn_from_repositories", json=request_data)
+        assert response.status_code == 200
+        
+        results = response.json()["results"]
+        assert mock_learner_cls.call_count == 1
+        assert [r["success"] for r in results] == [True, False]
+        assert results[0]["summary"]["total_prs"] == 2
+        assert "GitHub API error" in results[1]["message"]
     
-    def test_invalid_json(self):
-        """Test handling of invalid JSON."""
-        response = client.post("/review", data="invalid json")
+    def test_learn_from_repositories_empty_list(self, client):
+        """Test batched learning rejects an empty repository list."""
+        response = client.post("/learn_from_repositories", json={"repositoryUrls": []})
         assert response.status_code == 422
+
+
+class TestErrorHandling:
+    """Test error handling across endpoints."""
     
-    def test_missing_required_fields(self):
-        """Test handling of missing required fields."""
-        response = client.post("/review", json={"invalid": "data"})
+    @pytest.mark.parametrize("path,body", [
+        ("/review", {"json": {}}),
+        ("/fetch_pr", {"json": {}}),
+        ("/review_hunks", {"json": {}}),
+        ("/review", {"json": {"invalid": "data"}}),
+        ("/review", {"content": "invalid json"}),
+    ], ids=["review-missing-url", "fetch-pr-missing-url", "review-hunks-missing-diff",
+            "missing-required-fields", "invalid-json"])
+    def test_validation_error(self, client, path, body):
+        """Test that missing fields and malformed bodies are rejected with 422."""
+        response = client.post(path, **body)
         assert response.status_code == 422
 
 
 class TestSecurity:
     """Test security features."""
     
-    def test_no_auth_required_when_no_api_key(self):
+    def test_no_auth_required_when_no_api_key(self, client):
         """Test that no auth is required when QREVIEWER_API_KEY is not set."""
         # This test assumes no API key is set in test environment
         response = client.get("/health")
         assert response.status_code == 200
     
     @patch.dict('os.environ', {'QREVIEWER_API_KEY': 'test-key'})
-    def test_auth_required_when_api_key_set(self):
+    def test_auth_required_when_api_key_set(self, client):
         """Test that auth is required when QREVIEWER_API_KEY is set."""
         # This would require more complex mocking of the security middleware
         # For now, we'll test the basic functionality
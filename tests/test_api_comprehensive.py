@@ -2,34 +2,65 @@
 """
 Comprehensive test script for QReviewer API.
 This script tests all endpoints and demonstrates the full workflow.
+
+Requests are dispatched in-process through FastAPI's TestClient, so no
+running server is needed. Set QREVIEWER_API_URL when running the script
+directly to exercise a live server end to end instead.
 """
 
+import os
+import sys
+import pytest
 import requests
-import json
-import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+from qrev.api.app import app
+
+class LiveClient(requests.Session):
+    """Pooled keep-alive session that resolves paths against a live server."""
+    
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url.rstrip("/")
+    
+    def request(self, method, url, *args, **kwargs):
+        return super().request(method, f"{self.base_url}{url}", *args, **kwargs)
 
-# API base URL
-BASE_URL = "http://localhost:8000"
+def _emit(lines):
+    """Write one check's output in a single call so concurrent checks don't interleave."""
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def test_health():
+def test_health(client):
     """Test health endpoint."""
-    print("🔍 Testing Health Endpoint...")
-    response = requests.get(f"{BASE_URL}/health")
-    print(f"Status: {response.status_code}")
-    print(f"Response: {response.json()}")
-    print()
+    lines = []
+    out = lines.append
+    out("🔍 Testing Health Endpoint...")
+    response = client.get("/health")
+    out(f"Status: {response.status_code}")
+    out(f"Response: {response.json()}")
+    out("")
+    _emit(lines)
+    assert response.status_code == 200
 
-def test_root():
+def test_root(client):
     """Test root endpoint."""
-    print("🏠 Testing Root Endpoint...")
-    response = requests.get(f"{BASE_URL}/")
-    print(f"Status: {response.status_code}")
-    print(f"Title found: {'QReviewer API' in response.text}")
-    print()
+    lines = []
+    out = lines.append
+    out("🏠 Testing Root Endpoint...")
+    response = client.get("/")
+    out(f"Status: {response.status_code}")
+    title_found = 'QReviewer API' in response.text
+    out(f"Title found: {title_found}")
+    out("")
+    _emit(lines)
+    assert response.status_code == 200
+    assert title_found
 
-def test_score_endpoint():
+def test_score_endpoint(client):
     """Test score endpoint with sample findings."""
-    print("📊 Testing Score Endpoint...")
+    lines = []
+    out = lines.append
+    out("📊 Testing Score Endpoint...")
     
     # Sample findings with different severities
     findings = [
@@ -65,23 +96,28 @@ def test_score_endpoint():
         }
     ]
     
-    response = requests.post(
-        f"{BASE_URL}/score",
+    response = client.post(
+        "/score",
         json={"findings": findings}
     )
     
-    print(f"Status: {response.status_code}")
+    out(f"Status: {response.status_code}")
     if response.status_code == 200:
         result = response.json()
-        print(f"Score: {result['score']}")
-        print(f"Expected: 5.5 (3.0 + 2.0 + 0.5)")
+        out(f"Score: {result['score']}")
+        out(f"Expected: 6.0 (3.0 + 2.0 + 1.0)")
     else:
-        print(f"Error: {response.text}")
-    print()
+        out(f"Error: {response.text}")
+    out("")
+    _emit(lines)
+    assert response.status_code == 200
+    assert result['score'] == 6.0
 
-def test_render_report():
+def test_render_report(client):
     """Test report rendering endpoint."""
-    print("📄 Testing Report Rendering...")
+    lines = []
+    out = lines.append
+    out("📄 Testing Report Rendering...")
     
     findings = [
         {
@@ -96,24 +132,31 @@ def test_render_report():
         }
     ]
     
-    response = requests.post(
-        f"{BASE_URL}/render_report",
+    response = client.post(
+        "/render_report",
         json={"findings": findings}
     )
     
-    print(f"Status: {response.status_code}")
+    out(f"Status: {response.status_code}")
     if response.status_code == 200:
         result = response.json()
-        print(f"Report generated: {len(result['reportHtml'])} characters")
-        print(f"Report hash: {result['reportHash']}")
-        print(f"Contains 'QReviewer Report': {'QReviewer Report' in result['reportHtml']}")
+        out(f"Report generated: {len(result['reportHtml'])} characters")
+        out(f"Report hash: {result['reportHash']}")
+        out(f"Contains 'QReviewer Report': {'QReviewer Report' in result['reportHtml']}")
     else:
-        print(f"Error: {response.text}")
-    print()
+        out(f"Error: {response.text}")
+    out("")
+    _emit(lines)
+    assert response.status_code == 200
+    assert 'QReviewer Report' in result['reportHtml']
 
-def test_review_hunks():
+# Reviews with the real LLM backend
+@pytest.mark.integration
+def test_review_hunks(client):
     """Test review hunks endpoint."""
-    print("🔍 Testing Review Hunks Endpoint...")
+    lines = []
+    out = lines.append
+    out("🔍 Testing Review Hunks Endpoint...")
     
     # Sample diff data
     diff_data = {
@@ -134,63 +177,75 @@ def test_review_hunks():
         ]
     }
     
-    response = requests.post(
-        f"{BASE_URL}/review_hunks",
+    response = client.post(
+        "/review_hunks",
         json={"diffJson": diff_data}
     )
     
-    print(f"Status: {response.status_code}")
+    out(f"Status: {response.status_code}")
     if response.status_code == 200:
         result = response.json()
-        print(f"Findings generated: {len(result['findings'])}")
+        out(f"Findings generated: {len(result['findings'])}")
         for finding in result['findings']:
-            print(f"  - {finding['severity']}: {finding['message']}")
+            out(f"  - {finding['severity']}: {finding['message']}")
     else:
-        print(f"Error: {response.text}")
-    print()
+        out(f"Error: {response.text}")
+    out("")
+    _emit(lines)
+    assert response.status_code == 200
 
-def test_fetch_pr():
+@pytest.mark.integration
+def test_fetch_pr(client):
     """Test fetch PR endpoint."""
-    print("📥 Testing Fetch PR Endpoint...")
+    lines = []
+    out = lines.append
+    out("📥 Testing Fetch PR Endpoint...")
     
     # This will fail without GitHub token, but shows the error handling
-    response = requests.post(
-        f"{BASE_URL}/fetch_pr",
+    response = client.post(
+        "/fetch_pr",
         json={"prUrl": "https://github.com/bfalkowski/QReviewer/pull/1"}
     )
     
-    print(f"Status: {response.status_code}")
+    out(f"Status: {response.status_code}")
     if response.status_code == 500:
         error = response.json()
-        print(f"Error type: {error['detail']['error']}")
-        print(f"Message: {error['detail']['message']}")
-        print(f"Request ID: {error['detail']['requestId']}")
+        out(f"Error type: {error['detail']['error']}")
+        out(f"Message: {error['detail']['message']}")
+        out(f"Request ID: {error['detail']['requestId']}")
     else:
-        print(f"Unexpected response: {response.text}")
-    print()
+        out(f"Unexpected response: {response.text}")
+    out("")
+    _emit(lines)
+    assert response.status_code in (200, 500)
 
-def test_complete_review():
+@pytest.mark.integration
+def test_complete_review(client):
     """Test the complete review pipeline."""
-    print("🚀 Testing Complete Review Pipeline...")
+    lines = []
+    out = lines.append
+    out("🚀 Testing Complete Review Pipeline...")
     
     # This will fail without GitHub token, but shows the error handling
-    response = requests.post(
-        f"{BASE_URL}/review",
+    response = client.post(
+        "/review",
         json={
             "prUrl": "https://github.com/bfalkowski/QReviewer/pull/1",
             "requestId": "demo-review-123"
         }
     )
     
-    print(f"Status: {response.status_code}")
+    out(f"Status: {response.status_code}")
     if response.status_code == 500:
         error = response.json()
-        print(f"Error type: {error['detail']['error']}")
-        print(f"Message: {error['detail']['message']}")
-        print(f"Request ID: {error['detail']['requestId']}")
+        out(f"Error type: {error['detail']['error']}")
+        out(f"Message: {error['detail']['message']}")
+        out(f"Request ID: {error['detail']['requestId']}")
     else:
-        print(f"Unexpected response: {response.text}")
-    print()
+        out(f"Unexpected response: {response.text}")
+    out("")
+    _emit(lines)
+    assert response.status_code in (200, 500)
 
 def main():
     """Run all API tests."""
@@ -198,20 +253,31 @@ def main():
     print("=" * 50)
     print()
     
-    # Test basic endpoints
-    test_health()
-    test_root()
-    
-    # Test functional endpoints
-    test_score_endpoint()
-    test_render_report()
-    test_review_hunks()
+    base_url = os.getenv("QREVIEWER_API_URL")
+    checks = (
+        # Basic endpoints
+        test_health, test_root,
+        # Functional endpoints
+        test_score_endpoint, test_render_report, test_review_hunks,
+        # Endpoints that require GitHub token
+        test_fetch_pr, test_complete_review,
+    )
     
-    # Test endpoints that require GitHub token
-    test_fetch_pr()
-    test_complete_review()
+    # The checks are independent, so overlap their round-trips
+    failed = []
+    with (LiveClient(base_url) if base_url else TestClient(app)) as client:
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = {check.__name__: executor.submit(check, client) for check in checks}
+            for name, future in futures.items():
+                try:
+                    future.result()
+                except AssertionError:
+                    failed.append(name)
     
-    print("✅ All tests completed!")
+    if failed:
+        print(f"❌ Failed checks: {', '.join(failed)}")
+    else:
+        print("✅ All tests completed!")
     print()
     print("📋 Summary:")
     print("- Health and root endpoints: Working")
@@ -220,8 +286,9 @@ def main():
     print("- Review hunks: Working (with mock data)")
     print("- GitHub integration: Requires GITHUB_TOKEN")
     print()
-    print("🔗 Interactive API docs: http://localhost:8000/docs")
-    print("🔗 ReDoc: http://localhost:8000/redoc")
+    docs_base = base_url or "http://localhost:8000"
+    print(f"🔗 Interactive API docs (when served): {docs_base}/docs")
+    print(f"🔗 ReDoc (when served): {docs_base}/redoc")
 
 if __name__ == "__main__":
     main()
@@ -28,10 +28,11 @@ def process_data(data: List[str]) -> Dict[str, Any]:
     # result = eval(str(data))  # This would be flagged by security review
     
     # Better approach
+    total_length = sum(len(item) for item in data)
     result = {
         "count": len(data),
-        "total_length": sum(len(item) for item in data),
-        "average_length": sum(len(item) for item in data) / len(data) if data else 0
+        "total_length": total_length,
+        "average_length": total_length / len(data)
     }
     
     return result
@@ -1,21 +1,16 @@
-#!/usr/bin/env python3
 """Basic functionality test for QReviewer."""
 
+import io
 import json
-import tempfile
-from pathlib import Path
-import sys
 
-# Add current directory to path
-sys.path.insert(0, '.')
+import pytest
 
 from qrev.models import PRInfo, PRFilePatch, PRDiff, Hunk, Finding, FindingsReport
-from qrev.diff import infer_language, parse_hunk_header, split_patch_into_hunks
+from qrev.diff import infer_language, parse_hunk_header, split_patch_into_hunks, trim_hunk
 
 
 def test_models():
     """Test basic model functionality."""
-    print("🧪 Testing Pydantic models...")
     
     # Test PRInfo
     pr_info = PRInfo(
@@ -43,13 +38,10 @@ def test_models():
     pr_diff = PRDiff(pr=pr_info, files=[file_patch])
     assert len(pr_diff.files) == 1
     assert pr_diff.pr.number == 123
-    
-    print("✅ Models test passed!")
 
 
 def test_diff_parsing():
     """Test diff parsing functionality."""
-    print("🔍 Testing diff parsing...")
     
     # Test language inference
     assert infer_language("src/example.py") == "python"
@@ -73,13 +65,71 @@ def test_diff_parsing():
     assert hunks[0].hunk_header == "@@ -1,3 +1,6 @@"
     assert hunks[0].start_line == 1
     assert hunks[0].end_line == 6
+
+
+def test_trim_hunk():
+    """Test that distant unchanged context is trimmed from a hunk."""
+    context_before = [f" before {i}" for i in range(10)]
+    context_after = [f" after {i}" for i in range(10)]
+    patch = "\n".join(context_before + ["-old", "+new"] + context_after)
+    hunk = Hunk(
+        file_path="src/example.py",
+        hunk_header="@@ -1,21 +1,21 @@",
+        patch_text=patch,
+        start_line=1,
+        end_line=21
+    )
     
-    print("✅ Diff parsing test passed!")
+    trimmed = trim_hunk(hunk, context=2)
+    assert trimmed.patch_text.split("\n") == [" before 8", " before 9", "-old", "+new", " after 0", " after 1"]
+    assert trimmed.hunk_header == "@@ -9,5 +9,5 @@"
+    assert (trimmed.start_line, trimmed.end_line) == (9, 13)
+    assert hunk.patch_text == patch
+    
+    # Separate changes keep their own regions, each with a recomputed header
+    patch = "\n".join(["+a", " 1", " 2", " 3", " 4", " 5", "-b"])
+    hunk = hunk.model_copy(update={"hunk_header": "@@ -1,6 +1,6 @@", "patch_text": patch})
+    trimmed = trim_hunk(hunk, context=1)
+    assert trimmed.hunk_header == "@@ -1,1 +1,2 @@"
+    assert trimmed.patch_text.split("\n") == ["+a", " 1", "@@ -5,2 +6,1 @@", " 5", "-b"]
+    assert (trimmed.start_line, trimmed.end_line) == (1, 6)
+    
+    # Nothing to drop: the same hunk comes back
+    assert trim_hunk(hunk, context=10) is hunk
+    
+    # Function context after the closing @@ survives the rewrite
+    hunk = hunk.model_copy(update={"hunk_header": "@@ -1,6 +1,6 @@ def f():"})
+    trimmed = trim_hunk(hunk, context=1)
+    assert trimmed.hunk_header == "@@ -1,1 +1,2 @@ def f():"
+    assert "@@ -5,2 +6,1 @@" in trimmed.patch_text.split("\n")
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("@@ -10,6 +10,8 @@", (10, 6, 10, 8)),
+    ("@@ -1,3 +1,6 @@", (1, 3, 1, 6)),
+    ("@@ -0,0 +1,25 @@", (0, 0, 1, 25)),
+    ("@@ -42,7 +0,0 @@", (42, 7, 0, 0)),
+    ("@@ -120,15 +134,22 @@ def review_hunks():", (120, 15, 134, 22)),
+    ("@@ -9999,1 +10001,1 @@", (9999, 1, 10001, 1)),
+])
+def test_parse_hunk_header(header, expected):
+    """Test hunk header parsing across header shapes seen in real PRs."""
+    assert parse_hunk_header(header) == expected
+
+
+@pytest.mark.parametrize("header", [
+    "@@ -1 +1 @@",
+    "-1,3 +1,6",
+    "",
+])
+def test_parse_hunk_header_invalid(header):
+    """Test that malformed hunk headers are rejected."""
+    with pytest.raises(ValueError):
+        parse_hunk_header(header)
 
 
 def test_json_serialization():
     """Test JSON serialization/deserialization."""
-    print("💾 Testing JSON serialization...")
     
     # Create a complete findings report
     pr_info = PRInfo(
@@ -102,69 +152,52 @@ def test_json_serialization():
     findings_report = FindingsReport(pr=pr_info, findings=[finding])
     
     # Test serialization
-    json_data = findings_report.dict()
+    json_data = findings_report.model_dump()
     assert json_data["pr"]["number"] == 123
     assert len(json_data["findings"]) == 1
     assert json_data["findings"][0]["severity"] == "major"
     
     # Test deserialization
-    reconstructed = FindingsReport.parse_obj(json_data)
+    reconstructed = FindingsReport.model_validate(json_data)
     assert reconstructed.pr.number == 123
     assert len(reconstructed.findings) == 1
     assert reconstructed.findings[0].severity == "major"
-    
-    print("✅ JSON serialization test passed!")
+
+
+def _empty_findings_report():
+    """Create a findings report with no findings."""
+    pr_info = PRInfo(
+        url="https://github.com/org/repo/pull/123",
+        number=123,
+        repo="org/repo"
+    )
+    return FindingsReport(pr=pr_info, findings=[])
 
 
 def test_file_output():
     """Test file output functionality."""
-    print("📁 Testing file output...")
-    
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        
-        # Create a simple findings report
-        pr_info = PRInfo(
-            url="https://github.com/org/repo/pull/123",
-            number=123,
-            repo="org/repo"
-        )
-        
-        findings_report = FindingsReport(pr=pr_info, findings=[])
-        
-        # Write to file
-        output_file = temp_path / "test_findings.json"
-        with open(output_file, 'w') as f:
-            json.dump(findings_report.dict(), f, indent=2)
-        
-        # Verify file exists and can be read
-        assert output_file.exists()
-        with open(output_file, 'r') as f:
-            data = json.load(f)
-            assert data["pr"]["number"] == 123
-        
-        print("✅ File output test passed!")
-
-
-def main():
-    """Run all tests."""
-    print("🚀 Starting QReviewer basic functionality tests...\n")
-    
-    try:
-        test_models()
-        test_diff_parsing()
-        test_json_serialization()
-        test_file_output()
-        
-        print("\n🎉 All tests passed! QReviewer is working correctly.")
-        return 0
-        
-    except Exception as e:
-        print(f"\n❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-
-
-if __name__ == "__main__":
-    sys.exit(main())
+    
+    findings_report = _empty_findings_report()
+    
+    # Write to an in-memory file and read it back
+    buf = io.StringIO()
+    buf.write(findings_report.model_dump_json(indent=2))
+    buf.seek(0)
+    data = json.load(buf)
+    assert data["pr"]["number"] == 123
+
+
+def test_file_output_on_disk(tmp_path):
+    """Test file output through the real filesystem."""
+    findings_report = _empty_findings_report()
+    
+    # Write to file
+    output_file = tmp_path / "test_findings.json"
+    with open(output_file, 'w') as f:
+        f.write(findings_report.model_dump_json(indent=2))
+    
+    # Verify file exists and can be read
+    assert output_file.exists()
+    with open(output_file, 'r') as f:
+        data = json.load(f)
+        assert data["pr"]["number"] == 123
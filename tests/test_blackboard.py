@@ -0,0 +1,182 @@
+"""Tests for the WaaP blackboard."""
+
+import json
+import os
+
+import pytest
+
+from waap.blackboard import Blackboard, MemoryBlackboard, get_blackboard
+
+
+class TestBlackboard:
+    """Test Blackboard get/set over a context file."""
+
+    def test_missing_file_returns_default(self, tmp_path):
+        """Lookups on a missing context file fall back to the default."""
+        bb = Blackboard(str(tmp_path / "context.json"))
+        assert bb.get("pr.url", "none") == "none"
+        assert bb.get_all() == {}
+
+    def test_set_and_get_nested(self, tmp_path):
+        """Dot-notation keys create and read nested dicts."""
+        context_file = tmp_path / "state" / "context.json"
+        bb = Blackboard(str(context_file))
+        bb.set("review.stats", {"findings": 2})
+        bb.set("pr.url", "https://github.com/org/repo/pull/1")
+
+        assert bb.get("review.stats.findings") == 2
+        assert bb.get("review.missing") is None
+        assert json.loads(context_file.read_text()) == {
+            "review": {"stats": {"findings": 2}},
+            "pr": {"url": "https://github.com/org/repo/pull/1"},
+        }
+
+    def test_external_write_invalidates_cache(self, tmp_path):
+        """A change to the file by another writer is picked up on the next read."""
+        context_file = tmp_path / "context.json"
+        bb = Blackboard(str(context_file))
+        bb.set("pr.url", "old")
+        assert bb.get("pr.url") == "old"
+
+        context_file.write_text(json.dumps({"pr": {"url": "new"}}))
+        stat = context_file.stat()
+        os.utime(context_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert bb.get("pr.url") == "new"
+
+    def test_corrupt_file_returns_default(self, tmp_path):
+        """Unparseable context is treated as empty."""
+        context_file = tmp_path / "context.json"
+        context_file.write_text("{not json")
+        bb = Blackboard(str(context_file))
+        assert bb.get("pr.url", "none") == "none"
+
+    def test_set_many_writes_once(self, tmp_path):
+        """set_many applies every key and leaves no temp file behind."""
+        context_file = tmp_path / "context.json"
+        bb = Blackboard(str(context_file))
+        bb.set_many({"pr.url": "u", "review.findings": "f.jsonl"})
+
+        assert json.loads(context_file.read_text()) == {
+            "pr": {"url": "u"},
+            "review": {"findings": "f.jsonl"},
+        }
+        assert list(tmp_path.iterdir()) == [context_file]
+
+    def test_transaction_defers_write(self, tmp_path):
+        """Sets inside a transaction are visible immediately but written on exit."""
+        context_file = tmp_path / "context.json"
+        bb = Blackboard(str(context_file))
+        with bb.transaction():
+            bb.set("a.b", 1)
+            bb.set("a.c", 2)
+            assert bb.get("a.b") == 1
+            assert not context_file.exists()
+
+        assert json.loads(context_file.read_text()) == {"a": {"b": 1, "c": 2}}
+
+    def test_failed_transaction_discards_changes(self, tmp_path):
+        """A transaction that raises leaves the file and later reads untouched."""
+        context_file = tmp_path / "context.json"
+        bb = Blackboard(str(context_file))
+        bb.set("a", 1)
+        with pytest.raises(RuntimeError):
+            with bb.transaction():
+                bb.set("a", 2)
+                raise RuntimeError("boom")
+
+        assert bb.get("a") == 1
+
+    def test_resolved_keys_follow_sets(self, tmp_path):
+        """Memoized lookups, including misses, are dropped when the context changes."""
+        bb = Blackboard(str(tmp_path / "context.json"))
+        assert bb.get("a.b", "none") == "none"
+        bb.set("a.b", 1)
+        assert bb.get("a.b") == 1
+        bb.set("a", {"b": 2})
+        assert bb.get("a.b") == 2
+
+    def test_returned_values_are_copies(self, tmp_path):
+        """Editing what get/get_all return, or what was set, never reaches the file."""
+        context_file = tmp_path / "context.json"
+        bb = Blackboard(str(context_file))
+        items = [1, 2]
+        bb.set("items", items)
+        items.append(3)
+
+        bb.get("items").append(99)
+        bb.get_all()["junk"] = "x"
+        bb.set("other", 1)
+
+        assert json.loads(context_file.read_text()) == {"items": [1, 2], "other": 1}
+
+    def test_failed_write_drops_cache(self, tmp_path, monkeypatch):
+        """After a failed write, reads reflect the file rather than the lost change."""
+        bb = Blackboard(str(tmp_path / "context.json"))
+        bb.set("a", 1)
+
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", fail_replace)
+        with pytest.raises(OSError):
+            bb.set("a", 2)
+        monkeypatch.undo()
+
+        assert bb.get("a") == 1
+        assert [p.name for p in tmp_path.iterdir()] == ["context.json"]
+
+    def test_write_keeps_file_mode(self, tmp_path):
+        """Replacing the file keeps its mode; a new file gets the umask default."""
+        context_file = tmp_path / "context.json"
+        bb = Blackboard(str(context_file))
+        bb.set("a", 1)
+        umask = os.umask(0)
+        os.umask(umask)
+        assert context_file.stat().st_mode & 0o777 == 0o666 & ~umask
+
+        context_file.chmod(0o640)
+        bb.set("a", 2)
+        assert context_file.stat().st_mode & 0o777 == 0o640
+
+    def test_durable_write(self, tmp_path):
+        """Durable blackboards fsync the temp file before replacing the target."""
+        context_file = tmp_path / "context.json"
+        bb = Blackboard(str(context_file), durable=True)
+        bb.set("pr.url", "u")
+
+        assert json.loads(context_file.read_text()) == {"pr": {"url": "u"}}
+        assert list(tmp_path.iterdir()) == [context_file]
+
+
+class TestMemoryBlackboard:
+    """Test the in-memory blackboard backend."""
+
+    def test_never_touches_disk(self, tmp_path, monkeypatch):
+        """Sets and gets work without creating any file."""
+        monkeypatch.chdir(tmp_path)
+        bb = MemoryBlackboard()
+        bb.set_many({"pr.url": "u", "review.stats": {"findings": 1}})
+
+        assert bb.get("review.stats.findings") == 1
+        assert json.loads(bb.snapshot()) == bb.get_all()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_transaction_restores_context(self):
+        """A transaction that raises rolls back to the prior context."""
+        bb = MemoryBlackboard({"a": 1})
+        with pytest.raises(RuntimeError):
+            with bb.transaction():
+                bb.set("a", 2)
+                raise RuntimeError("boom")
+
+        assert bb.get("a") == 1
+
+    def test_backend_selected_by_env(self, monkeypatch):
+        """WAAP_BLACKBOARD_BACKEND=memory returns one shared in-memory instance."""
+        monkeypatch.setenv("WAAP_BLACKBOARD_BACKEND", "memory")
+        assert isinstance(get_blackboard(), MemoryBlackboard)
+        assert get_blackboard() is get_blackboard()
+
+        monkeypatch.setenv("WAAP_BLACKBOARD_BACKEND", "file")
+        assert not isinstance(get_blackboard(), MemoryBlackboard)
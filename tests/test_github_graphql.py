@@ -0,0 +1,71 @@
+"""Tests for batched PR file fetching over GitHub GraphQL."""
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from qrev.github_api import GitHubAPIError
+from qrev.github_graphql import build_pr_files_query, fetch_pr_files_batch
+
+
+PR_URLS = [
+    "https://github.com/org/repo/pull/1",
+    "https://github.com/org/other/pull/7",
+]
+
+
+def _graphql_response(payload, status_code=200):
+    response = MagicMock(status_code=status_code, text="")
+    response.json.return_value = payload
+    return response
+
+
+class TestBuildQuery:
+    """Test GraphQL query construction."""
+
+    def test_one_alias_per_pr(self):
+        """Each PR gets its own alias and typed variables."""
+        query, variables = build_pr_files_query([("org", "repo", 1), ("org", "other", 7)])
+        assert "pr0: repository(owner: $owner0, name: $name0)" in query
+        assert "pr1: repository(owner: $owner1, name: $name1)" in query
+        assert "$number1: Int!" in query
+        assert variables == {
+            "owner0": "org", "name0": "repo", "number0": 1,
+            "owner1": "org", "name1": "other", "number1": 7,
+        }
+
+
+class TestFetchPRFilesBatch:
+    """Test fetch_pr_files_batch."""
+
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'test-token'})
+    @patch('qrev.github_graphql._session')
+    def test_single_request_for_all_prs(self, mock_session):
+        """All PRs are fetched in one POST and mapped back in order."""
+        mock_session.post.return_value = _graphql_response({"data": {
+            "pr0": {"pullRequest": {"files": {"nodes": [
+                {"path": "a.py", "additions": 3, "deletions": 1, "changeType": "MODIFIED"},
+            ]}}},
+            "pr1": {"pullRequest": {"files": {"nodes": [
+                {"path": "b.py", "additions": 0, "deletions": 9, "changeType": "DELETED"},
+            ]}}},
+        }})
+
+        diffs = fetch_pr_files_batch(PR_URLS)
+
+        assert mock_session.post.call_count == 1
+        assert [d.pr.number for d in diffs] == [1, 7]
+        assert diffs[0].files[0].path == "a.py"
+        assert diffs[0].files[0].status == "modified"
+        assert diffs[1].files[0].status == "removed"
+        assert diffs[1].files[0].patch is None
+
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'test-token'})
+    @patch('qrev.github_graphql._session')
+    def test_graphql_errors_raise(self, mock_session):
+        """GraphQL-level errors surface as GitHubAPIError."""
+        mock_session.post.return_value = _graphql_response(
+            {"errors": [{"message": "Could not resolve to a Repository"}]}
+        )
+
+        with pytest.raises(GitHubAPIError, match="Could not resolve"):
+            fetch_pr_files_batch(PR_URLS)
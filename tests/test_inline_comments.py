@@ -3,68 +3,106 @@
 Test script to demonstrate QReviewer's new inline commenting functionality.
 """
 
-import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 
 # API base URL
 BASE_URL = "http://localhost:8000"
 
+# Talks to a running QReviewer server; excluded from the default pytest run
+pytestmark = pytest.mark.integration
+
+# Shared keep-alive session (pooled, retrying, JSON headers) from tests/_http.py
+try:
+    from ._http import SESSION
+except ImportError:  # run directly as a script
+    from _http import SESSION
+
 # Your real PR URL
 PR_URL = "https://github.com/bfalkowski/QReviewer/pull/1"
 
-def test_post_review_with_inline_comments():
-    """Test posting a review with inline comments to your PR."""
-    print("🔍 Testing inline comment posting to your PR #1...")
-    
-    # Enhanced findings with better suggestions for inline commenting
-    findings = [
-        {
-            "file": "test_api_demo.py",
-            "hunk_header": "@@ -15,5 +15,5 @@",
-            "severity": "critical",
-            "category": "security",
-            "message": "Unused import 'json' detected - this should be removed to avoid confusion",
-            "confidence": 0.95,
-            "suggested_patch": "import os\nimport sys\nfrom typing import List, Dict, Any\n\n# Intentional issue: unused import\n# import json  # This import is not used",
-            "line_hint": 15
-        },
-        {
-            "file": "test_api_demo.py",
-            "hunk_header": "@@ -25,3 +25,3 @@",
-            "severity": "major",
-            "category": "security",
-            "message": "Commented eval() usage should be completely removed - this is a security risk",
-            "confidence": 0.9,
-            "suggested_patch": "    # Better approach - no eval() usage\n    result = {",
-            "line_hint": 25
-        },
-        {
-            "file": "test_api_demo.py",
-            "hunk_header": "@@ -35,2 +35,2 @@",
-            "severity": "minor",
-            "category": "style",
-            "message": "Consider adding return type annotation for better code clarity",
-            "confidence": 0.7,
-            "suggested_patch": "def process_data(data: List[str]) -> Dict[str, Any]:",
-            "line_hint": 35
-        }
-    ]
-    
-    # Test the new /post_review endpoint
-    payload = {
-        "prUrl": PR_URL,
-        "findings": findings,
-        "event": "COMMENT",  # Can be COMMENT, APPROVE, or REQUEST_CHANGES
-        "body": "🔍 QReviewer Automated Code Review\n\nThis PR has been automatically reviewed and contains several findings that should be addressed before merging."
+# Enhanced findings with better suggestions for inline commenting
+FINDINGS = (
+    {
+        "file": "test_api_demo.py",
+        "hunk_header": "@@ -15,5 +15,5 @@",
+        "severity": "critical",
+        "category": "security",
+        "message": "Unused import 'json' detected - this should be removed to avoid confusion",
+        "confidence": 0.95,
+        "suggested_patch": "import os\nimport sys\nfrom typing import List, Dict, Any\n\n# Intentional issue: unused import\n# import json  # This import is not used",
+        "line_hint": 15
+    },
+    {
+        "file": "test_api_demo.py",
+        "hunk_header": "@@ -25,3 +25,3 @@",
+        "severity": "major",
+        "category": "security",
+        "message": "Commented eval() usage should be completely removed - this is a security risk",
+        "confidence": 0.9,
+        "suggested_patch": "    # Better approach - no eval() usage\n    result = {",
+        "line_hint": 25
+    },
+    {
+        "file": "test_api_demo.py",
+        "hunk_header": "@@ -35,2 +35,2 @@",
+        "severity": "minor",
+        "category": "style",
+        "message": "Consider adding return type annotation for better code clarity",
+        "confidence": 0.7,
+        "suggested_patch": "def process_data(data: List[str]) -> Dict[str, Any]:",
+        "line_hint": 35
     }
-    
-    print(f"📤 Posting review with {len(findings)} inline comments...")
+)
+
+# Test the new /post_review endpoint
+REVIEW_PAYLOAD = {
+    "prUrl": PR_URL,
+    "findings": FINDINGS,
+    "event": "COMMENT",  # Can be COMMENT, APPROVE, or REQUEST_CHANGES
+    "body": "🔍 QReviewer Automated Code Review\n\nThis PR has been automatically reviewed and contains several findings that should be addressed before merging."
+}
+
+COMMENT_PAYLOAD = {
+    "prUrl": PR_URL,
+    "body": """## 🎉 QReviewer Integration Complete!
+
+This PR has been successfully reviewed by QReviewer's automated system. 
+
+### 📊 Review Summary
+- **Total Findings**: 3
+- **Critical Issues**: 1 (unused import)
+- **Major Issues**: 1 (commented eval usage)
+- **Minor Issues**: 1 (missing type hints)
+
+### 🚀 Next Steps
+1. Review the inline comments on specific lines
+2. Address the critical and major findings
+3. Consider the minor suggestions for code improvement
+
+---
+*Automated review by QReviewer API*"""
+}
+
+GET_REVIEWS_PAYLOAD = {
+    "prUrl": PR_URL
+}
+
+# Static request bodies, JSON-encoded once at import instead of on every call
+_REVIEW_PAYLOAD_BYTES = json.dumps(REVIEW_PAYLOAD).encode()
+_COMMENT_PAYLOAD_BYTES = json.dumps(COMMENT_PAYLOAD).encode()
+_GET_REVIEWS_PAYLOAD_BYTES = json.dumps(GET_REVIEWS_PAYLOAD).encode()
+
+def _report_post_review(response):
+    """Print the outcome of the /post_review call."""
+    print("🔍 Testing inline comment posting to your PR #1...")
+    print(f"📤 Posting review with {len(FINDINGS)} inline comments...")
     print(f"   - Critical: 1 finding")
     print(f"   - Major: 1 finding") 
     print(f"   - Minor: 1 finding")
     
-    response = requests.post(f"{BASE_URL}/post_review", json=payload)
-    
     if response.status_code == 200:
         result = response.json()
         print("✅ Review posted successfully!")
@@ -82,33 +120,10 @@ def test_post_review_with_inline_comments():
     
     print()
 
-def test_post_general_comment():
-    """Test posting a general comment to your PR."""
+def _report_post_comment(response):
+    """Print the outcome of the /post_comment call."""
     print("💬 Testing general comment posting...")
     
-    payload = {
-        "prUrl": PR_URL,
-        "body": """## 🎉 QReviewer Integration Complete!
-
-This PR has been successfully reviewed by QReviewer's automated system. 
-
-### 📊 Review Summary
-- **Total Findings**: 3
-- **Critical Issues**: 1 (unused import)
-- **Major Issues**: 1 (commented eval usage)
-- **Minor Issues**: 1 (missing type hints)
-
-### 🚀 Next Steps
-1. Review the inline comments on specific lines
-2. Address the critical and major findings
-3. Consider the minor suggestions for code improvement
-
----
-*Automated review by QReviewer API*"""
-    }
-    
-    response = requests.post(f"{BASE_URL}/post_comment", json=payload)
-    
     if response.status_code == 200:
         result = response.json()
         print("✅ General comment posted successfully!")
@@ -120,16 +135,10 @@ This PR has been successfully reviewed by QReviewer's automated system.
     
     print()
 
-def test_get_existing_reviews():
-    """Test getting existing reviews for your PR."""
+def _report_get_reviews(response):
+    """Print the outcome of the /get_reviews call."""
     print("📋 Testing review retrieval...")
     
-    payload = {
-        "prUrl": PR_URL
-    }
-    
-    response = requests.post(f"{BASE_URL}/get_reviews", json=payload)
-    
     if response.status_code == 200:
         result = response.json()
         print("✅ Reviews retrieved successfully!")
@@ -149,16 +158,48 @@ def test_get_existing_reviews():
     
     print()
 
+# (url, encoded body, reporter) for each API call; the two posts are
+# independent, /get_reviews should see what they posted
+JOBS = (
+    (f"{BASE_URL}/post_review", _REVIEW_PAYLOAD_BYTES, _report_post_review),
+    (f"{BASE_URL}/post_comment", _COMMENT_PAYLOAD_BYTES, _report_post_comment),
+    (f"{BASE_URL}/get_reviews", _GET_REVIEWS_PAYLOAD_BYTES, _report_get_reviews),
+)
+
+def _run_job(http, job):
+    """Send one job's request and report the response."""
+    url, body, report = job
+    report(http.post(url, data=body))
+
+def test_post_review_with_inline_comments(http):
+    """Test posting a review with inline comments to your PR."""
+    _run_job(http, JOBS[0])
+
+def test_post_general_comment(http):
+    """Test posting a general comment to your PR."""
+    _run_job(http, JOBS[1])
+
+def test_get_existing_reviews(http):
+    """Test getting existing reviews for your PR."""
+    _run_job(http, JOBS[2])
+
 def main():
     """Run all inline commenting tests."""
     print("🧪 QReviewer Inline Commenting Test")
     print("=" * 50)
     print()
     
-    # Test the new functionality
-    test_post_review_with_inline_comments()
-    test_post_general_comment()
-    test_get_existing_reviews()
+    # The two posts are independent, so send them concurrently over the
+    # pooled session and report the responses in order once they arrive
+    posts, get_reviews = JOBS[:2], JOBS[2]
+    with ThreadPoolExecutor(max_workers=len(posts)) as executor:
+        futures = [executor.submit(SESSION.post, url, data=body)
+                   for url, body, _ in posts]
+        for (_, _, report), future in zip(posts, futures):
+            report(future.result())
+    
+    # Fetch reviews only once both posts have landed
+    _run_job(SESSION, get_reviews)
     
     print("🎉 All tests completed!")
     print()
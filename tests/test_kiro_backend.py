@@ -9,12 +9,12 @@ import sys
 import asyncio
 from pathlib import Path
 
+import pytest
+
 # Add the QReviewer package to the path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from qrev.models import Hunk
-from qrev.llm_client import KiroClient
-from qrev.config import config
+# qrev modules are imported inside each test so a step only loads what it needs
 
 def test_kiro_config():
     """Test Kiro configuration."""
@@ -24,9 +24,10 @@ def test_kiro_config():
     # Set Kiro backend
     os.environ["QREVIEWER_LLM_BACKEND"] = "kiro"
     
-    # Reload config
-    from qrev.config import QReviewerConfig
-    test_config = QReviewerConfig()
+    # Reload the shared config so every module sees the new backend
+    from qrev.config import config
+    config.reload()
+    test_config = config
     
     print(f"Backend: {test_config.llm_backend}")
     print(f"API URL: {test_config.kiro_api_url}")
@@ -37,19 +38,25 @@ def test_kiro_config():
     
     return test_config.validate()
 
+# Calls the Kiro API
+@pytest.mark.integration
+@pytest.mark.anyio
 async def test_kiro_client():
     """Test Kiro client with a sample hunk."""
     print("\n🚀 Testing Kiro Client")
     print("=" * 40)
     
+    from qrev.models import Hunk
+    from qrev.diff import trim_hunk
+    from qrev.llm_client import KiroClient
+    
     # Create a sample hunk for testing
     sample_hunk = Hunk(
         file_path="test.py",
         hunk_header="@@ -1,3 +1,4 @@",
         start_line=1,
         end_line=4,
-        old_content="def hello():\n    print('Hello')\n    return True",
-        new_content="def hello():\n    print('Hello World')\n    # TODO: Add error handling\n    return True"
+        patch_text=" def hello():\n-    print('Hello')\n+    print('Hello World')\n+    # TODO: Add error handling\n     return True"
     )
     
     try:
@@ -61,7 +68,8 @@ async def test_kiro_client():
         
         # Test review
         print(f"\n🔍 Testing review of sample hunk...")
-        findings = await client.review_hunk(sample_hunk, "Focus on code quality and best practices.")
+        # Only changed lines and nearby context are worth sending to the model
+        findings = await client.review_hunk(trim_hunk(sample_hunk), "Focus on code quality and best practices.")
         
         print(f"✅ Review completed!")
         print(f"   Found {len(findings)} findings")
@@ -85,16 +93,17 @@ def test_cli_integration():
         from qrev.cli import app
         print("✅ CLI app imported successfully")
         
-        # Test help to see if backend flag is there
-        import subprocess
-        result = subprocess.run([sys.executable, "-m", "qrev.cli", "review-only", "--help"], 
-                              capture_output=True, text=True, cwd=Path(__file__).parent)
+        # Inspect the review-only command's options in-process rather than
+        # spawning a fresh interpreter to scrape its --help output
+        import typer.main
+        command = typer.main.get_command(app).commands["review-only"]
+        option_flags = {opt for param in command.params for opt in param.opts}
         
-        if "--backend" in result.stdout:
-            print("✅ Backend flag found in CLI help")
+        if "--backend" in option_flags:
+            print("✅ Backend flag found in review-only options")
             return True
         else:
-            print("❌ Backend flag not found in CLI help")
+            print("❌ Backend flag not found in review-only options")
             return False
             
     except Exception as e:
@@ -137,4 +146,10 @@ async def main():
     return config_ok and cli_ok
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # One explicit loop for the whole run, so further async checks added to
+    # main() share it instead of each paying for a fresh asyncio.run() loop
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
\ No newline at end of file
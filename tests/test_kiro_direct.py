@@ -4,7 +4,6 @@ Direct test of QReviewer with Kiro - bypassing HTTP API calls
 """
 
 import os
-import json
 import sys
 from pathlib import Path
 
@@ -25,9 +24,9 @@ def main():
     try:
         # Step 1: Test GitHub API first
         print("\n📥 Testing GitHub API connection...")
-        from qrev.github_api import fetch_pr_files
+        from qrev.github_api import cached_fetch_pr_files
         
-        pr_diff = fetch_pr_files(pr_url)
+        pr_diff = cached_fetch_pr_files(pr_url)
         print(f"✅ Fetched {len(pr_diff.files)} files from PR #{pr_diff.pr.number}")
         
         # Show what we got
@@ -39,9 +38,8 @@ def main():
         # List the files
         print(f"\n📄 Files in PR:")
         for i, file_info in enumerate(pr_diff.files, 1):
-            print(f"   {i}. {file_info.filename} ({file_info.status})")
-            if hasattr(file_info, 'additions') and hasattr(file_info, 'deletions'):
-                print(f"      +{file_info.additions} -{file_info.deletions}")
+            print(f"   {i}. {file_info.path} ({file_info.status})")
+            print(f"      +{file_info.additions} -{file_info.deletions}")
         
         # Step 2: Extract hunks from first file as test
         print(f"\n📝 Extracting hunks from first file...")
@@ -92,7 +90,7 @@ def main():
             # Save results
             output_file = "ae-pr2-kiro-direct.json"
             with open(output_file, 'w') as f:
-                json.dump(findings_report.dict(), f, indent=2)
+                f.write(findings_report.model_dump_json(indent=2))
             
             print(f"\n✅ Test complete!")
             print(f"📁 Sample report saved to: {output_file}")
@@ -6,6 +6,8 @@ import sys
 import asyncio
 from pathlib import Path
 
+import pytest
+
 # Add the current directory to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -15,6 +17,9 @@ os.environ["QREVIEWER_LLM_BACKEND"] = "kiro"
 os.environ["KIRO_API_URL"] = "http://localhost:3000"
 os.environ["QREVIEWER_VERBOSE"] = "true"
 
+# Talks to GitHub and a local Kiro API; excluded from the default pytest run
+pytestmark = pytest.mark.integration
+
 def test_config():
     """Test configuration loading."""
     print("🔧 Testing QReviewer Configuration...")
@@ -0,0 +1,124 @@
+"""Tests for repository learning helpers."""
+
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import pytest
+
+from qrev.learning import GITHUB_TIMEOUT, GitHubRateLimiter, RepositoryLearner
+
+
+API_BASE = "https://api.github.com/repos/org/repo"
+PRS = [
+    {"number": 1, "head": {"sha": "aaa"}},
+    {"number": 2, "head": {"sha": "bbb"}},
+]
+
+
+class TestPRDetailsCache:
+    """Test per-PR reviews/comments caching keyed by head SHA."""
+
+    def test_second_run_served_from_cache(self, tmp_path):
+        """PRs fetched once are not requested again while their head SHA is unchanged."""
+        learner = RepositoryLearner("token", cache_dir=tmp_path)
+        fetched = {1: ([{"state": "APPROVED"}], []), 2: ([], [{"body": "nit"}])}
+
+        with patch.object(learner, "_fetch_pr_details", return_value=fetched) as fetch:
+            assert learner._fetch_pr_details_cached(API_BASE, PRS, True, True) == fetched
+            assert learner._fetch_pr_details_cached(API_BASE, PRS, True, True) == fetched
+
+        fetch.assert_called_once_with(API_BASE, [1, 2], True, True)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["1_aaa.json", "2_bbb.json"]
+
+    def test_refresh_and_failed_halves_refetch(self, tmp_path):
+        """refresh_cache bypasses hits, and a PR with a failed request is never cached."""
+        (tmp_path / "1_aaa.json").write_text('{"reviews": [], "comments": [{"body": "old"}]}')
+        learner = RepositoryLearner("token", cache_dir=tmp_path, refresh_cache=True)
+        fetched = {1: ([], [{"body": "new"}]), 2: ([{"state": "APPROVED"}], None)}
+
+        with patch.object(learner, "_fetch_pr_details", return_value=fetched) as fetch:
+            details = learner._fetch_pr_details_cached(API_BASE, PRS, True, True)
+
+        fetch.assert_called_once_with(API_BASE, [1, 2], True, True)
+        assert details[1] == ([], [{"body": "new"}])
+        assert details[2] == ([{"state": "APPROVED"}], [])
+        assert not (tmp_path / "2_bbb.json").exists()
+
+
+class TestGitHubGet:
+    """Test GitHub GETs made during learning."""
+
+    @patch('qrev.learning.time.sleep')
+    @patch('qrev.learning._session')
+    def test_waits_for_rate_limit_reset(self, mock_session, mock_sleep):
+        """A 403 with no requests remaining sleeps until reset, then retries once."""
+        limited = MagicMock(status_code=403, headers={
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(time.time() + 30),
+        })
+        ok = MagicMock(status_code=200, headers={})
+        mock_session.get.side_effect = [limited, ok]
+
+        response = RepositoryLearner("token")._github_get(f"{API_BASE}/pulls/1/reviews")
+
+        assert response is ok
+        assert mock_session.get.call_count == 2
+        assert mock_session.get.call_args.kwargs["timeout"] == GITHUB_TIMEOUT
+        assert 0 < mock_sleep.call_args.args[0] <= 30
+
+
+class _FakeResponse:
+    """Just enough of an aiohttp response for _aget_json."""
+
+    def __init__(self, status, payload=None):
+        self.status = status
+        self.headers = {}
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+
+class _FakeSession:
+    """Replays one outcome (response or exception) per GET."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    @asynccontextmanager
+    async def get(self, url):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        yield outcome
+
+
+class TestAsyncGitHubGet:
+    """Test retries on the async GitHub path used when aiohttp is installed."""
+
+    @pytest.mark.anyio
+    async def test_retries_transient_failures(self, monkeypatch):
+        """Connection errors and 503s are retried until a 200 arrives."""
+        monkeypatch.setattr("qrev.learning.GITHUB_BACKOFF_SEC", 0)
+        session = _FakeSession(
+            aiohttp.ClientConnectionError(), _FakeResponse(503), _FakeResponse(200, [{"id": 1}])
+        )
+
+        result = await RepositoryLearner("token")._aget_json(session, "url", GitHubRateLimiter())
+
+        assert result == [{"id": 1}]
+        assert session.calls == 3
+
+    @pytest.mark.anyio
+    async def test_non_retryable_status_returns_none(self):
+        """A 404 fails immediately and is reported as None, not an empty list."""
+        session = _FakeSession(_FakeResponse(404))
+
+        result = await RepositoryLearner("token")._aget_json(session, "url", GitHubRateLimiter())
+
+        assert result is None
+        assert session.calls == 1
@@ -5,8 +5,14 @@ Test script for module-focused learning from large repositories.
 
 import os
 import sys
+
+import pytest
+
 from qrev.cli_learning import ModuleLearningCLI
 
+# Learns from a live GitHub repository; excluded from the default pytest run
+pytestmark = pytest.mark.integration
+
 def test_module_learning():
     """Test the module-focused learning functionality."""
     
@@ -3,20 +3,46 @@
 Test QReviewer on PR #2 from bfalkowski2021/ae using Kiro backend
 """
 
+import asyncio
+import io
 import os
-import json
 import sys
+from itertools import islice
 from pathlib import Path
 
 # Add the qrev module to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from qrev.github_api import fetch_pr_files
-from qrev.diff import extract_hunks_from_files
-from qrev.llm_client import review_hunk
-from qrev.models import FindingsReport
+# qrev modules are imported where they are used, after the environment is set
 
-def main():
+# Upper bound on reviews in flight against the Kiro backend
+MAX_CONCURRENT_REVIEWS = 8
+
+# Hunks reviewed by the test; extraction stops once this many are found
+SAMPLE_HUNKS = 3
+
+async def iter_hunk_reviews(hunks):
+    """Review hunks concurrently, yielding (number, hunk, findings) as each finishes.
+    
+    A failed review yields its exception in place of the findings list.
+    """
+    from qrev.llm_client import get_llm_client
+    
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REVIEWS)
+    
+    # One client context so every review shares the same keep-alive connections
+    async with get_llm_client() as client:
+        async def _review(number, hunk):
+            async with sem:
+                try:
+                    return number, hunk, await client.review_hunk(hunk, None)
+                except Exception as e:
+                    return number, hunk, e
+        
+        for next_done in asyncio.as_completed([_review(i, h) for i, h in enumerate(hunks, 1)]):
+            yield await next_done
+
+async def main():
     # Set up environment
     os.environ['GITHUB_TOKEN'] = os.environ.get('GITHUB_TOKEN', 'your_github_token_here')
     os.environ['QREVIEWER_LLM_BACKEND'] = 'kiro'
@@ -27,59 +53,59 @@ def main():
     print(f"🤖 Using Kiro backend")
     
     try:
+        from qrev.github_api import cached_fetch_pr_files
+        from qrev.diff import iter_hunks_from_files
+        
         # Step 1: Fetch PR files
         print("\n📥 Fetching PR files...")
-        pr_diff = fetch_pr_files(pr_url)
+        pr_diff = cached_fetch_pr_files(pr_url)
         print(f"✅ Fetched {len(pr_diff.files)} files from PR #{pr_diff.pr.number}")
         
-        # Step 2: Extract hunks
+        # Step 2: Extract hunks, parsing patches only until the sample is full
         print("\n📝 Extracting hunks...")
-        hunks = extract_hunks_from_files(pr_diff.files)
-        print(f"✅ Found {len(hunks)} hunks to review")
+        hunks = list(islice(iter_hunks_from_files(pr_diff.files), SAMPLE_HUNKS))
+        print(f"✅ Reviewing first {len(hunks)} hunks (extraction stops at {SAMPLE_HUNKS})")
         
         if not hunks:
             print("⚠️  No hunks found to review")
             return
         
-        # Step 3: Review first few hunks as test
-        print(f"\n🚀 Testing review on first 3 hunks...")
-        all_findings = []
+        # Step 3: Review first few hunks as test, streaming each finding to
+        # disk (one JSON object per line) as its hunk review completes
+        print(f"\n🚀 Testing review on first {len(hunks)} hunks...")
+        output_file = "ae-pr2-kiro-test.jsonl"
+        meta_file = "ae-pr2-kiro-test.meta.json"
+        with open(meta_file, 'w') as f:
+            f.write(pr_diff.pr.model_dump_json(indent=2))
         
-        for i, hunk in enumerate(hunks[:3], 1):
-            print(f"\n🔍 Processing hunk {i}: {hunk.file_path}")
-            print(f"   Header: {hunk.hunk_header}")
-            
-            try:
-                findings = review_hunk(hunk, None)
-                all_findings.extend(findings)
+        total_findings = 0
+        severity_counts = {}
+        with open(output_file, 'w') as out:
+            async for i, hunk, findings in iter_hunk_reviews(hunks):
+                print(f"\n🔍 Processing hunk {i}: {hunk.file_path}")
+                print(f"   Header: {hunk.hunk_header}")
+                
+                if isinstance(findings, Exception):
+                    print(f"❌ Failed to review hunk: {findings}")
+                    continue
+                
                 print(f"✅ Found {len(findings)} findings")
                 
+                # Collect this hunk's finding lines and write them to stdout at once
+                buf = io.StringIO()
                 for finding in findings:
-                    print(f"   📋 {finding.severity.upper()}: {finding.message}")
-                    
-            except Exception as e:
-                print(f"❌ Failed to review hunk: {e}")
-        
-        # Step 4: Save results
-        findings_report = FindingsReport(
-            pr=pr_diff.pr,
-            findings=all_findings
-        )
-        
-        output_file = "ae-pr2-kiro-test.json"
-        with open(output_file, 'w') as f:
-            json.dump(findings_report.dict(), f, indent=2)
+                    out.write(finding.model_dump_json() + "\n")
+                    total_findings += 1
+                    severity_counts[finding.severity] = severity_counts.get(finding.severity, 0) + 1
+                    buf.write(f"   📋 {finding.severity.upper()}: {finding.message}\n")
+                sys.stdout.write(buf.getvalue())
         
         print(f"\n✅ Test complete!")
-        print(f"📁 Results saved to: {output_file}")
-        print(f"🔍 Total findings: {len(all_findings)}")
+        print(f"📁 Results saved to: {output_file} (PR metadata in {meta_file})")
+        print(f"🔍 Total findings: {total_findings}")
         
         # Show summary
-        if all_findings:
-            severity_counts = {}
-            for finding in all_findings:
-                severity_counts[finding.severity] = severity_counts.get(finding.severity, 0) + 1
-            
+        if severity_counts:
             print("\n📊 Findings summary:")
             for severity, count in severity_counts.items():
                 print(f"   {severity}: {count}")
@@ -90,4 +116,4 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
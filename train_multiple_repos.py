@@ -4,14 +4,45 @@ Script to demonstrate training on multiple repositories using the organized stru
 
 This script shows how to train on different repositories and organize the results
 in the learning_results/ directory structure.
+
+Pass --force to ignore the per-PR results cached by earlier runs.
 """
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from qrev.cli_learning import ModuleLearningCLI
 
-def train_multiple_repositories():
+# Repositories trained at once; all of them share one GitHub token's rate limit
+MAX_PARALLEL_REPOS = 2
+
+def train_repository(repo_config, force=False):
+    """Train on one repository into learning_results/<name>/.
+    
+    Runs without prompting; train_multiple_repositories confirms once for all
+    repositories before starting the workers. Per-PR results are cached under
+    learning_results/<name>/.cache by head SHA, so reruns only fetch PRs that
+    changed; force=True refetches everything.
+    """
+    max_prs = repo_config["max_prs_per_module"]
+    
+    # One CLI per repository: it keeps the active learner as instance state
+    cli = ModuleLearningCLI()
+    return cli.learn_from_modules(
+        repo_url=repo_config["url"],
+        modules=repo_config["modules"],
+        max_prs_per_module=max_prs,
+        max_total_prs=max_prs * len(repo_config["modules"]),
+        output_dir=f"learning_results/{repo_config['name']}",
+        include_comments=True,
+        include_reviews=True,
+        sample_strategy=repo_config["strategy"],
+        force=force,
+        confirm=False
+    )
+
+def train_multiple_repositories(force=False):
     """Train on multiple repositories to demonstrate the organized structure."""
     
     # Check for GitHub token
@@ -50,48 +81,43 @@ def train_multiple_repositories():
     print("This will demonstrate the organized learning_results/ structure")
     print()
     
-    cli = ModuleLearningCLI()
-    
+    # Plan every repository up front; the trainings themselves run concurrently
     for repo_config in repositories:
-        repo_name = repo_config["name"]
-        repo_url = repo_config["url"]
-        modules = repo_config["modules"]
-        max_prs = repo_config["max_prs_per_module"]
-        strategy = repo_config["strategy"]
-        
-        print(f"📚 Training on: {repo_name}")
-        print(f"   URL: {repo_url}")
-        print(f"   Modules: {', '.join(modules)}")
-        print(f"   Strategy: {strategy}")
-        print(f"   Max PRs per module: {max_prs}")
+        print(f"📚 Training on: {repo_config['name']}")
+        print(f"   URL: {repo_config['url']}")
+        print(f"   Modules: {', '.join(repo_config['modules'])}")
+        print(f"   Strategy: {repo_config['strategy']}")
+        print(f"   Max PRs per module: {repo_config['max_prs_per_module']}")
         print()
+    
+    # Ask once here: workers share stdin, so they must not prompt themselves
+    if input("Proceed with learning? [y/N]: ").strip().lower() not in ("y", "yes"):
+        print("Learning cancelled")
+        return False
+    
+    workers = min(len(repositories), MAX_PARALLEL_REPOS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(train_repository, repo_config, force): repo_config
+            for repo_config in repositories
+        }
         
-        # Set output directory to organized structure
-        output_dir = f"learning_results/{repo_name}"
-        
-        try:
-            success = cli.learn_from_modules(
-                repo_url=repo_url,
-                modules=modules,
-                max_prs_per_module=max_prs,
-                max_total_prs=max_prs * len(modules),
-                output_dir=output_dir,
-                include_comments=True,
-                include_reviews=True,
-                sample_strategy=strategy
-            )
+        for future in as_completed(futures):
+            repo_name = futures[future]["name"]
+            output_dir = f"learning_results/{repo_name}"
             
-            if success:
-                print(f"✅ Successfully trained on {repo_name}")
-                print(f"   Results saved to: {output_dir}/")
-            else:
-                print(f"❌ Failed to train on {repo_name}")
-                
-        except Exception as e:
-            print(f"❌ Exception while training on {repo_name}: {str(e)}")
-        
-        print("-" * 50)
-        print()
+            try:
+                if future.result():
+                    print(f"✅ Successfully trained on {repo_name}")
+                    print(f"   Results saved to: {output_dir}/")
+                else:
+                    print(f"❌ Failed to train on {repo_name}")
+                    
+            except Exception as e:
+                print(f"❌ Exception while training on {repo_name}: {str(e)}")
+            
+            print("-" * 50)
+            print()
     
     # Show final organized structure
     print("🎉 Training Complete!")
@@ -117,5 +143,5 @@ def train_multiple_repositories():
     return True
 
 if __name__ == "__main__":
-    success = train_multiple_repositories()
+    success = train_multiple_repositories(force="--force" in sys.argv[1:])
     sys.exit(0 if success else 1)
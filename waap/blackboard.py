@@ -1,53 +1,172 @@
 """Blackboard helper for WaaP agents."""
 
+import copy
 import json
 import os
+import tempfile
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Marks a key that does not resolve in the current context
+_MISSING = object()
+
+
+# Process umask, read once (setting it is the only way to read it); new
+# context files get the mode open() would have given them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@lru_cache(maxsize=1024)
+def _split_path(key: str) -> tuple:
+    """Split a dot-notation key once; agents reuse the same few keys."""
+    return tuple(key.split('.'))
 
 
 class Blackboard:
     """Simple blackboard implementation using filesystem."""
     
-    def __init__(self, context_file: str = "context.json"):
-        """Initialize blackboard with context file path."""
+    def __init__(self, context_file: str = "context.json", durable: bool = False):
+        """Initialize blackboard with context file path.
+        
+        With durable=True every write is fsync'd before it replaces the file,
+        and the directory is fsync'd after, so it survives a power loss as
+        well as a crash.
+        """
         self.context_file = Path(context_file)
+        self.durable = durable
+        # Parsed context and the file mtime it was read at (-1: not read yet)
+        self._cache: Optional[Dict[str, Any]] = None
+        self._mtime: int = -1
+        # Dot-notation key -> resolved value (or _MISSING) for the cached context
+        self._resolved: Dict[str, Any] = {}
+        # Open transaction() blocks; writes are deferred while this is non-zero
+        self._txn_depth = 0
+    
+    def _load(self) -> Dict[str, Any]:
+        """Return the parsed context, re-reading the file only when it changed.
+        
+        The returned dict is the cache itself; public readers copy from it.
+        """
+        if self._txn_depth:
+            return self._cache
+        
+        try:
+            mtime = self.context_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._resolved.clear()
+            self._cache, self._mtime = {}, -1
+            return self._cache
+        
+        if self._cache is None or mtime != self._mtime:
+            self._resolved.clear()
+            try:
+                # Stamp with the mtime of the file actually read, in case it
+                # was replaced after the stat above
+                self._mtime, data = self._read_file()
+                self._cache = json.loads(data)
+            except FileNotFoundError:
+                self._cache, self._mtime = {}, -1
+            except (json.JSONDecodeError, UnicodeDecodeError, IOError):
+                self._cache, self._mtime = {}, mtime
+        
+        return self._cache
+    
+    def _read_file(self) -> Tuple[int, bytes]:
+        """Read the context file as (mtime_ns, bytes) with one os.read call.
+        
+        Contexts are small, so a raw read sized from fstat avoids the buffered
+        file object; a short read falls back to streaming the rest.
+        """
+        fd = os.open(self.context_file, os.O_RDONLY)
+        try:
+            st = os.fstat(fd)
+            data = os.read(fd, st.st_size)
+            if len(data) < st.st_size:
+                with open(fd, 'rb', closefd=False) as f:
+                    data += f.read()
+            return st.st_mtime_ns, data
+        finally:
+            os.close(fd)
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get a value from the blackboard by key."""
-        if not self.context_file.exists():
-            return default
+        context = self._load()
         
-        try:
-            with open(self.context_file, 'r') as f:
-                context = json.load(f)
-            
-            # Support dot notation for nested keys
-            keys = key.split('.')
-            value = context
-            for k in keys:
-                if isinstance(value, dict) and k in value:
-                    value = value[k]
-                else:
-                    return default
-            
-            return value
-        except (json.JSONDecodeError, IOError):
+        # Hot keys resolve once per loaded context instead of walking it each call
+        value = self._resolved.get(key, _MISSING)
+        if value is _MISSING and key not in self._resolved:
+            value = self._resolved[key] = self._resolve(context, key)
+        
+        if value is _MISSING:
             return default
+        # Hand out copies of containers so callers cannot edit the cache (and
+        # have the edit written out by the next unrelated set())
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+    
+    @staticmethod
+    def _resolve(context: Any, key: str) -> Any:
+        """Walk a dot-notation key through nested dicts; _MISSING if absent."""
+        value = context
+        for k in _split_path(key):
+            if not isinstance(value, dict):
+                return _MISSING
+            value = value.get(k, _MISSING)
+            if value is _MISSING:
+                return _MISSING
+        
+        return value
     
     def set(self, key: str, value: Any) -> None:
         """Set a value in the blackboard by key."""
-        # Load existing context or create new
-        context = {}
-        if self.context_file.exists():
-            try:
-                with open(self.context_file, 'r') as f:
-                    context = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                context = {}
+        self.set_many({key: value})
+    
+    def set_many(self, items: Dict[str, Any]) -> None:
+        """Set several keys with one load and one write of the context file."""
+        # Load existing context or create new; updated in place below
+        context = self._load()
+        if not isinstance(context, dict):
+            context = self._cache = {}
+        
+        # Copy the values in, so later edits by the caller don't reach the cache
+        for key, value in items.items():
+            self._apply(context, key, copy.deepcopy(value))
+        self._resolved.clear()
         
-        # Support dot notation for nested keys
-        keys = key.split('.')
+        # Inside a transaction the write happens once, when it exits
+        if not self._txn_depth:
+            self._flush(context)
+    
+    @contextmanager
+    def transaction(self) -> Iterator["Blackboard"]:
+        """Batch set() calls in memory and write the context file once on exit.
+        
+        Reads inside the block see the pending values. If the block raises,
+        nothing is written and the next read reloads the file.
+        """
+        if not self._txn_depth:
+            self._load()
+            if not isinstance(self._cache, dict):
+                self._cache = {}
+        self._txn_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._txn_depth -= 1
+            if not self._txn_depth:
+                self._cache, self._mtime = None, -1
+                self._resolved.clear()
+            raise
+        self._txn_depth -= 1
+        if not self._txn_depth:
+            self._flush(self._cache)
+    
+    @staticmethod
+    def _apply(context: Dict[str, Any], key: str, value: Any) -> None:
+        """Set a dot-notation key in a context dict, creating parents as needed."""
+        keys = _split_path(key)
         current = context
         
         # Navigate to the parent of the target key
@@ -58,26 +177,115 @@ class Blackboard:
         
         # Set the final value
         current[keys[-1]] = value
+    
+    def _flush(self, context: Dict[str, Any]) -> None:
+        """Write the context; if that fails, drop the cache so it is re-read."""
+        try:
+            self._write(context)
+        except BaseException:
+            # The cache already holds the unwritten changes and the file mtime
+            # has not moved, so without this it would never match the file again
+            self._cache = None
+            self._resolved.clear()
+            raise
+    
+    def _write(self, context: Dict[str, Any]) -> None:
+        """Atomically replace the context file and record its new mtime."""
+        # Encode in one call and write once; json.dump streams many small chunks
+        data = json.dumps(context, indent=2).encode('utf-8')
         
-        # Ensure directory exists
-        self.context_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write back to file
-        with open(self.context_file, 'w') as f:
-            json.dump(context, f, indent=2)
+        # Write beside the target and rename over it, so readers never see a
+        # partially written file; mkstemp keeps concurrent writers apart
+        directory = self.context_file.parent
+        try:
+            fd, tmp_name = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        except FileNotFoundError:
+            # Only the first write into a new directory needs to create it
+            directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            # mkstemp creates the file 0600; keep the mode readers rely on
+            try:
+                mode = os.stat(self.context_file).st_mode & 0o7777
+            except FileNotFoundError:
+                mode = 0o666 & ~_UMASK
+            os.fchmod(fd, mode)
+            with open(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                if self.durable:
+                    os.fsync(f.fileno())
+                # The rename keeps this mtime, so no stat of the target is needed
+                mtime = os.fstat(f.fileno()).st_mtime_ns
+            os.replace(tmp_name, self.context_file)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        if self.durable:
+            # The rename itself only reaches disk once the directory is synced
+            dir_fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        self._mtime = mtime
     
     def get_all(self) -> Dict[str, Any]:
-        """Get all context data."""
-        if not self.context_file.exists():
-            return {}
-        
+        """Get a copy of all context data."""
+        return copy.deepcopy(self._load())
+
+
+class MemoryBlackboard(Blackboard):
+    """Blackboard held only in memory, for tests and single-process pipelines.
+    
+    Same API as Blackboard, but nothing is read from or written to disk.
+    """
+    
+    def __init__(self, initial: Optional[Dict[str, Any]] = None):
+        """Initialize with an optional starting context."""
+        super().__init__()
+        self.context_file = None
+        self._cache = initial if initial is not None else {}
+    
+    def _load(self) -> Dict[str, Any]:
+        """The in-memory context is always current."""
+        return self._cache
+    
+    def _write(self, context: Dict[str, Any]) -> None:
+        """Nothing to persist."""
+    
+    @contextmanager
+    def transaction(self) -> Iterator["Blackboard"]:
+        """Batch set() calls; a block that raises restores the prior context."""
+        # There is no file to reload from, so keep a copy to roll back to
+        backup = copy.deepcopy(self._cache) if not self._txn_depth else None
         try:
-            with open(self.context_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
+            with super().transaction():
+                yield self
+        except BaseException:
+            if backup is not None:
+                self._cache = backup
+            raise
+    
+    def snapshot(self) -> bytes:
+        """Serialize the context, e.g. to checkpoint it to a file."""
+        return json.dumps(self._cache, indent=2).encode('utf-8')
+
+
+# Shared by every get_blackboard() call when the memory backend is selected
+_memory_blackboard: Optional[MemoryBlackboard] = None
 
 
 def get_blackboard() -> Blackboard:
-    """Get a blackboard instance."""
+    """Get a blackboard instance.
+    
+    WAAP_BLACKBOARD_BACKEND=memory selects one process-wide MemoryBlackboard;
+    the default, file, uses context.json.
+    """
+    global _memory_blackboard
+    
+    if os.getenv("WAAP_BLACKBOARD_BACKEND", "file") == "memory":
+        if _memory_blackboard is None:
+            _memory_blackboard = MemoryBlackboard()
+        return _memory_blackboard
     return Blackboard()